@@ -1,5 +1,61 @@
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class Broker(Protocol):
+    """The structural interface shared by all broker implementations.
+
+    Any object with these attributes and an `authenticate` method satisfies
+    the protocol, whether or not it inherits from BrokerBase.
+
+    Attributes:
+        authenticated (bool): True if the broker is authenticated, otherwise False.
+        access_token (Optional[str]): The access token obtained after successful
+                                      authentication.
+    """
+    authenticated: bool
+    access_token: Optional[str]
+
+    def authenticate(self) -> Any:
+        """Authenticates with the broker's API."""
+        ...
+
+
+# Public method names per broker class, filled lazily by list_broker_functions().
+_list_functions_cache: Dict[type, List[str]] = {}
+
+
+def list_broker_functions(broker: Any) -> List[str]:
+    """Lists the public methods available on a broker object.
+
+    The broker's class hierarchy is walked up to (but excluding) BrokerBase,
+    or `object` for brokers that only satisfy the `Broker` protocol. Private
+    methods (those prefixed with an underscore) and methods defined on
+    BrokerBase are excluded. The result is computed once per class and cached.
+
+    Args:
+        broker (Any): The broker instance to inspect.
+
+    Returns:
+        List[str]: A sorted list of public method names.
+    """
+    cls = type(broker)
+    cached = _list_functions_cache.get(cls)
+    if cached is None:
+        methods = set()
+        for klass in cls.__mro__:
+            if klass is BrokerBase or klass is object:
+                break
+            methods.update(
+                name for name, value in klass.__dict__.items()
+                if not name.startswith('_')
+                and (callable(value) or isinstance(value, (staticmethod, classmethod)))
+            )
+        cached = sorted(methods - BrokerBase.__dict__.keys())
+        _list_functions_cache[cls] = cached
+    return list(cached)
+
 
 class BrokerBase:
     """A base class for broker implementations.
@@ -39,14 +95,9 @@ class BrokerBase:
     def list_functions(self) -> List[str]:
         """Lists the public methods available in the broker subclass.
 
-        This method inspects the subclass and returns a sorted list of public
-        method names, excluding methods from BrokerBase and private methods
-        (those prefixed with an underscore).
+        See `list_broker_functions`.
 
         Returns:
             List[str]: A sorted list of public method names.
         """
-        base_methods = set(dir(BrokerBase))
-        all_methods = set(dir(self))
-        public_methods = [m for m in all_methods - base_methods if not m.startswith('_')]
-        return sorted(public_methods) 
\ No newline at end of file
+        return list_broker_functions(self)
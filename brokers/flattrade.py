@@ -1,16 +1,70 @@
 import os
-import sys
+import io
+import asyncio
+import csv
+import json
 import hashlib
+import zipfile
+import time
+import functools
+import queue
 import requests
-from threading import Thread
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import Thread, Lock, Event
 from flask import Flask, request
-from typing import Dict, Any, Optional, List
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from typing import Dict, Any, Optional, List, Tuple
 
 from brokers.base import BrokerBase
 from logger import logger
-from NorenRestApiPy.NorenApi import NorenApi
+
+
+def _install_pooled_session() -> requests.Session:
+    """Routes NorenApi's HTTP calls through a shared, pooled session.
+
+    NorenApi issues every REST call via the module-level `requests.post`,
+    which opens a fresh TCP/TLS connection each time. Swapping the module's
+    `requests` reference for a keep-alive session lets back-to-back calls
+    reuse connections. The swap happens once per process.
+
+    Returns:
+        requests.Session: The session used by NorenApi.
+    """
+    from NorenRestApiPy import NorenApi as noren_api_module
+
+    if isinstance(noren_api_module.requests, requests.Session):
+        return noren_api_module.requests
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50,
+                          max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    noren_api_module.requests = session
+    return session
+
+
+@functools.lru_cache(maxsize=4096)
+def _ymd_to_timestamp(date_str: str) -> float:
+    """Converts a "YYYY-MM-DD" date to a local-midnight epoch timestamp.
+
+    Well-formed dates are sliced directly instead of going through
+    `strptime`, and results are memoized for repeated backtest ranges.
+
+    Args:
+        date_str (str): The date in "YYYY-MM-DD" format.
+
+    Returns:
+        float: The epoch timestamp of local midnight on that date.
+
+    Raises:
+        ValueError: If the date is not a valid "YYYY-MM-DD" string.
+    """
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        return datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10])).timestamp()
+    return datetime.strptime(date_str, "%Y-%m-%d").timestamp()
+
 
 class FlattradeBroker(BrokerBase):
     """A broker class for the Flattrade API.
@@ -19,20 +73,82 @@ class FlattradeBroker(BrokerBase):
     for the Flattrade platform. It features an automated authentication
     process that uses a temporary web server to capture the login token.
     """
+    # Daily symbol master per exchange: a URL template with an `{exchange}`
+    # placeholder, pointing at a zipped CSV with `TradingSymbol` and `Token`
+    # columns (the Noren `<EXCHANGE>_symbols.txt.zip` layout). Unset by default;
+    # without it every lookup goes through `searchscrip`.
+    SCRIP_MASTER_URL = os.getenv("FLATTRADE_SCRIP_MASTER_URL")
+    SCRIP_MASTER_DIR = "artifacts"
+    # Seconds before a failed symbol master download is attempted again
+    SCRIP_MASTER_RETRY_INTERVAL = 300
+    # Daily session tokens keyed by broker ID, reused across runs on the same day
+    SESSION_FILE = os.path.join(os.path.expanduser("~"), ".config", "flattrade", "session.json")
+
+    # Framework order vocabulary -> Noren order fields
+    _PRICE_TYPE_MAP = {
+        'MARKET': 'MKT',
+        'LIMIT': 'LMT',
+        'SL': 'SL-MKT',
+        'SL-M': 'SL-LMT'
+    }
+    _BUY_SELL_MAP = {'BUY': 'B', 'SELL': 'S'}
+    _PRODUCT_MAP = {'MIS': 'M', 'CNC': 'C'}
+
+    # Maximum time (seconds) a buffered tick waits before being flushed
+    TICK_FLUSH_INTERVAL = 0.1
+    # Buffered ticks kept before the oldest are evicted
+    TICK_BUFFER_SIZE = 100000
+
+    # Order coalescing: flush a batch at MAX_ORDER_BATCH orders or after MAX_ORDER_WAIT seconds
+    MAX_ORDER_BATCH = 50
+    MAX_ORDER_WAIT = 0.01
+
     def __init__(self):
         """Initializes the FlattradeBroker."""
         super().__init__()
         logger.info("Initializing FlattradeBroker...")
+        # Imported here so that importing this module stays cheap.
+        from NorenRestApiPy.NorenApi import NorenApi
         self.api = NorenApi(host='https://piconnect.flattrade.in/PiConnectTP/',
                             websocket='wss://piconnect.flattrade.in/PiConnectWSTp/')
+        self.session = _install_pooled_session()
         self.session_token = None
+        # Resolved instrument tokens keyed by (exchange, symbol)
+        self._token_cache: Dict[Tuple[str, str], str] = {}
+        # Local symbol master index keyed by (exchange, trading symbol)
+        self._scrip_index: Dict[Tuple[str, str], str] = {}
+        self._scrip_master_loaded = set()
+        # Monotonic time of the last failed symbol master load, per exchange
+        self._scrip_master_failed_at: Dict[str, float] = {}
+        self._scrip_master_lock = Lock()
+        # Ticks buffered by on_ticks and drained in batches by _flush_ticks
+        self._tick_buffer = deque(maxlen=self.TICK_BUFFER_SIZE)
+        self._tick_flusher = None
+        # Ticks evicted from the full buffer before they were flushed
+        self._ticks_evicted = 0
+        # Set once the WebSocket reports it is open
+        self._connected = Event()
+        # Orders queued by submit_order and sent in batches by _drain_orders
+        self._order_queue = queue.Queue()
+        self._order_drainer = None
+        # Long-lived pool that places drained orders; each resolves its own future
+        self._order_pool = ThreadPoolExecutor(max_workers=self.MAX_ORDER_BATCH, thread_name_prefix="flattrade-order")
         self.authenticate()
 
     def authenticate(self) -> Optional[str]:
-        """Authenticates with the Flattrade API using an automated flow.
+        """Authenticates with the Flattrade API.
+
+        The session token is taken from the first available source:
+        1. The `BROKER_SESSION_TOKEN` environment variable.
+        2. The session file at `SESSION_FILE`, if it was written today.
+        3. An automated browser login, which starts a temporary web server
+           to handle the redirect from the Flattrade login page.
 
-        This method starts a temporary web server to handle the redirect from
-        the Flattrade login page, automatically generating the session token.
+        Every token is validated with an authenticated call before use. A
+        rejected cached token is discarded and the browser login runs
+        instead. Tokens from the browser login are written to `SESSION_FILE`
+        (mode 0600) once validated, so later runs on the same day skip the
+        login.
 
         Returns:
             Optional[str]: The session token if successful, otherwise None.
@@ -45,6 +161,112 @@ class FlattradeBroker(BrokerBase):
             logger.error("Flattrade API key, secret, or user ID are not set in .env file.")
             return None
 
+        env_token = os.getenv("BROKER_SESSION_TOKEN")
+        cached_token = env_token or self._load_session_token(broker_id)
+        if cached_token:
+            ok, emsg = self._validate_session(broker_id, cached_token)
+            if ok:
+                return self._set_authenticated(cached_token)
+            logger.warning(f"Cached Flattrade session token was rejected ({emsg}); logging in again.")
+            if not env_token:
+                self._discard_session_token(broker_id)
+
+        token = self._login_via_browser(api_key, api_secret)
+        ok, emsg = self._validate_session(broker_id, token)
+        if not ok:
+            logger.error(f"Flattrade authentication failed: {emsg}")
+            self.authenticated = False
+            return None
+        self._save_session_token(broker_id, token)
+        return self._set_authenticated(token)
+
+    def _validate_session(self, broker_id: str, token: str) -> Tuple[bool, Optional[str]]:
+        """Sets `token` on the API client and checks it with a cheap authenticated call.
+
+        `NorenApi.set_session` only stores the token, so a revoked or expired
+        token is detected by fetching the account limits.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the token works, and the
+                error message if it does not.
+        """
+        self.api.set_session(userid=broker_id, password="", usertoken=token)
+        try:
+            ret = self.api.get_limits()
+        except Exception as e:
+            return False, str(e)
+        if isinstance(ret, dict) and ret.get('stat') == 'Ok':
+            return True, None
+        return False, ret.get('emsg') if isinstance(ret, dict) else "no response"
+
+    def _set_authenticated(self, token: str) -> str:
+        """Records a validated session token as the broker's access token."""
+        logger.info("Flattrade authentication successful.")
+        self.session_token = token
+        self.access_token = token
+        self.authenticated = True
+        return token
+
+    def _load_session_token(self, broker_id: str) -> Optional[str]:
+        """Returns today's session token for `broker_id` from `SESSION_FILE`, if any."""
+        session = self._read_sessions().get(broker_id) or {}
+        if session.get("DATE") == str(datetime.now().date()):
+            logger.info("Using cached Flattrade session token.")
+            return session.get("token")
+        return None
+
+    def _save_session_token(self, broker_id: str, token: str):
+        """Stores the session token for `broker_id` in `SESSION_FILE`, stamped with today's date."""
+        sessions = self._read_sessions()
+        sessions[broker_id] = {"DATE": str(datetime.now().date()), "token": token}
+        self._write_sessions(sessions)
+
+    def _discard_session_token(self, broker_id: str):
+        """Removes the session token for `broker_id` from `SESSION_FILE`."""
+        sessions = self._read_sessions()
+        if sessions.pop(broker_id, None) is not None:
+            self._write_sessions(sessions)
+
+    def _read_sessions(self) -> Dict[str, Dict[str, str]]:
+        """Returns the contents of `SESSION_FILE`, or an empty dict if it is missing or unreadable."""
+        if not os.path.exists(self.SESSION_FILE):
+            return {}
+        try:
+            with open(self.SESSION_FILE, "r") as f:
+                sessions = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable session file '{self.SESSION_FILE}': {e}")
+            return {}
+        return sessions if isinstance(sessions, dict) else {}
+
+    def _write_sessions(self, sessions: Dict[str, Dict[str, str]]):
+        """Atomically replaces `SESSION_FILE`, readable by the owner only (it holds bearer tokens)."""
+        try:
+            os.makedirs(os.path.dirname(self.SESSION_FILE), exist_ok=True)
+            tmp_path = f"{self.SESSION_FILE}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(sessions, f)
+            os.replace(tmp_path, self.SESSION_FILE)
+        except OSError as e:
+            logger.warning(f"Could not save Flattrade session token: {e}")
+
+    def _login_via_browser(self, api_key: str, api_secret: str) -> str:
+        """Captures a session token through the Flattrade browser login.
+
+        A temporary web server handles the redirect from the login page and
+        exchanges the request code for a session token. This call blocks
+        until the token has been captured.
+
+        Args:
+            api_key (str): The Flattrade API key.
+            api_secret (str): The Flattrade API secret.
+
+        Returns:
+            str: The session token.
+        """
+        captured = {}
+        token_ready = Event()
         app = Flask(__name__)
 
         @app.route('/', methods=['GET'])
@@ -67,7 +289,8 @@ class FlattradeBroker(BrokerBase):
                 token_data = response.json()
 
                 if token_data.get('stat') == 'Ok' and token_data.get('token'):
-                    self.session_token = token_data['token']
+                    captured['token'] = token_data['token']
+                    token_ready.set()
                     # Use a function to shut down the server
                     shutdown_server()
                     return "Authentication successful! You can close this window."
@@ -92,24 +315,69 @@ class FlattradeBroker(BrokerBase):
         print(f"\nPlease log in to Flattrade using this URL: {login_url}")
 
         # Wait until the token is captured
-        while not self.session_token:
-            pass
+        token_ready.wait()
+        return captured['token']
 
-        ret = self.api.set_session(userid=broker_id, password="", usertoken=self.session_token)
+    def _load_scrip_master(self, exchange: str):
+        """Loads the daily symbol master for an exchange into `_scrip_index`.
 
-        if ret and ret.get('stat') == 'Ok':
-            logger.info("Flattrade authentication successful.")
-            self.access_token = self.session_token
-            self.authenticated = True
-            return self.access_token
-        else:
-            logger.error(f"Flattrade authentication failed: {ret.get('emsg')}")
-            self.authenticated = False
-            return None
+        The master is downloaded at most once per trading day and stored as
+        a date-stamped JSON file under `SCRIP_MASTER_DIR`. Failures are logged
+        and leave the index empty, so lookups fall back to `searchscrip`; the
+        load is retried after `SCRIP_MASTER_RETRY_INTERVAL` seconds. Nothing
+        is loaded unless `SCRIP_MASTER_URL` is set.
+
+        Args:
+            exchange (str): The exchange whose symbol master to load (e.g., "NSE").
+        """
+        with self._scrip_master_lock:
+            if exchange in self._scrip_master_loaded or not self.SCRIP_MASTER_URL:
+                return
+            failed_at = self._scrip_master_failed_at.get(exchange)
+            if failed_at is not None and time.monotonic() - failed_at < self.SCRIP_MASTER_RETRY_INTERVAL:
+                return
+
+            today = str(datetime.now().date())
+            cache_file = os.path.join(self.SCRIP_MASTER_DIR, f"scrip_master_{exchange}.json")
+            tokens = None
+            if os.path.exists(cache_file):
+                try:
+                    with open(cache_file, "r") as f:
+                        cached = json.load(f)
+                    if cached.get("DATE") == today:
+                        tokens = cached.get("TOKENS", {})
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.warning(f"Ignoring unreadable symbol master cache '{cache_file}': {e}")
+
+            if tokens is None:
+                try:
+                    response = self.session.get(self.SCRIP_MASTER_URL.format(exchange=exchange), timeout=30)
+                    response.raise_for_status()
+                    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                        with archive.open(archive.namelist()[0]) as raw:
+                            reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8"))
+                            tokens = {row["TradingSymbol"]: row["Token"] for row in reader
+                                      if row.get("TradingSymbol") and row.get("Token")}
+                    os.makedirs(self.SCRIP_MASTER_DIR, exist_ok=True)
+                    with open(cache_file, "w") as f:
+                        json.dump({"DATE": today, "TOKENS": tokens}, f)
+                    logger.info(f"Loaded {len(tokens)} symbols from the {exchange} symbol master.")
+                except (requests.exceptions.RequestException, zipfile.BadZipFile, KeyError, IndexError, OSError) as e:
+                    logger.warning(f"Could not load {exchange} symbol master, falling back to searchscrip: {e}")
+                    self._scrip_master_failed_at[exchange] = time.monotonic()
+                    return
+
+            self._scrip_index.update({(exchange, tsym): token for tsym, token in tokens.items()})
+            self._scrip_master_loaded.add(exchange)
+            self._scrip_master_failed_at.pop(exchange, None)
 
     def _get_token(self, exchange: str, symbol: str) -> Optional[str]:
         """Retrieves the instrument token for a given symbol.
 
+        Tokens are cached per (exchange, symbol). Lookups are resolved locally
+        from the exchange's daily symbol master, and only hit the `searchscrip`
+        endpoint when the symbol is missing from it.
+
         Args:
             exchange (str): The exchange where the symbol is traded (e.g., "NSE").
             symbol (str): The trading symbol.
@@ -117,15 +385,28 @@ class FlattradeBroker(BrokerBase):
         Returns:
             Optional[str]: The instrument token if found, otherwise None.
         """
-        search_text = symbol
-        if exchange == 'NSE' and '-EQ' not in symbol:
-            search_text = f"{symbol}-EQ"
+        cache_key = (exchange, symbol)
+        token = self._token_cache.get(cache_key)
+        if token is not None:
+            return token
+
+        search_text = symbol if (exchange != 'NSE' or symbol.endswith('-EQ')) else symbol + '-EQ'
+
+        self._load_scrip_master(exchange)
+        token = self._scrip_index.get((exchange, search_text))
+        if token is not None:
+            self._token_cache[cache_key] = token
+            return token
 
         ret = self.api.searchscrip(exchange=exchange, searchtext=search_text)
-        if ret and ret.get('stat') == 'Ok' and ret.get('values'):
-            for value in ret['values']:
-                if value.get('tsym') == search_text:
-                    return value.get('token')
+        if ret and ret.get('stat') == 'Ok':
+            # Keep every symbol in the response so related lookups skip the network.
+            matches = {value['tsym']: value['token'] for value in ret.get('values') or ()}
+            self._scrip_index.update({(exchange, tsym): tok for tsym, tok in matches.items()})
+            token = matches.get(search_text)
+            if token:
+                self._token_cache[cache_key] = token
+                return token
 
         logger.error(f"Could not find token for {symbol} on {exchange}")
         return None
@@ -158,14 +439,13 @@ class FlattradeBroker(BrokerBase):
         Returns:
             Optional[List[Dict[str, Any]]]: A list of historical data points, or None.
         """
-        from datetime import datetime
         token = self._get_token(exchange, symbol)
         if not token:
             return None
 
         try:
-            start_timestamp = datetime.strptime(start_date, "%Y-%m-%d").timestamp()
-            end_timestamp = datetime.strptime(end_date, "%Y-%m-%d").timestamp()
+            start_timestamp = _ymd_to_timestamp(start_date)
+            end_timestamp = _ymd_to_timestamp(end_date)
         except ValueError:
             logger.error("Invalid date format for historical data. Please use YYYY-MM-DD.")
             return None
@@ -178,6 +458,49 @@ class FlattradeBroker(BrokerBase):
             interval=interval
         )
 
+    async def get_quote_async(self, symbol: str, exchange: str = 'NSE') -> Optional[Dict[str, Any]]:
+        """Asynchronous variant of `get_quote`.
+
+        The blocking NorenApi call runs in a worker thread, so several quotes
+        can be awaited concurrently.
+
+        Args:
+            symbol (str): The trading symbol.
+            exchange (str): The exchange where the symbol is traded. Defaults to 'NSE'.
+
+        Returns:
+            Optional[Dict[str, Any]]: The quote data, or None if not found.
+        """
+        return await asyncio.to_thread(self.get_quote, symbol, exchange)
+
+    async def get_historical_data_async(self, symbol: str, exchange: str, start_date: str, end_date: str, interval: str = '1') -> Optional[List[Dict[str, Any]]]:
+        """Asynchronous variant of `get_historical_data`.
+
+        Args:
+            symbol (str): The trading symbol.
+            exchange (str): The exchange where the symbol is traded.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            interval (str): The candle interval in minutes. Defaults to '1'.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: A list of historical data points, or None.
+        """
+        return await asyncio.to_thread(self.get_historical_data, symbol, exchange, start_date, end_date, interval)
+
+    async def get_quotes_bulk(self, symbols: List[str], exchange: str = 'NSE') -> Dict[str, Optional[Dict[str, Any]]]:
+        """Retrieves quotes for several symbols concurrently.
+
+        Args:
+            symbols (List[str]): A list of trading symbols.
+            exchange (str): The exchange of the symbols. Defaults to 'NSE'.
+
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: The quote data keyed by symbol.
+        """
+        quotes = await asyncio.gather(*(self.get_quote_async(symbol, exchange) for symbol in symbols))
+        return dict(zip(symbols, quotes))
+
     def place_order(self, symbol: str, quantity: int, price: float, transaction_type: str, order_type: str, product: str, exchange: str = 'NSE', tag: str = "strategy") -> Optional[str]:
         """Places a trading order.
 
@@ -196,15 +519,9 @@ class FlattradeBroker(BrokerBase):
         """
         logger.info(f"Placing order for {symbol} with quantity {quantity}")
 
-        buy_or_sell = 'B' if transaction_type == 'BUY' else 'S'
-        prd_type = 'M' if product == 'MIS' else 'C'
-        price_type_map = {
-            'MARKET': 'MKT',
-            'LIMIT': 'LMT',
-            'SL': 'SL-MKT',
-            'SL-M': 'SL-LMT'
-        }
-        price_type = price_type_map.get(order_type, 'MKT')
+        buy_or_sell = self._BUY_SELL_MAP.get(transaction_type, 'S')
+        prd_type = self._PRODUCT_MAP.get(product, 'C')
+        price_type = self._PRICE_TYPE_MAP.get(order_type, 'MKT')
         trigger_price = 0.0
         if order_type in ['SL', 'SL-M']:
             trigger_price = price
@@ -232,6 +549,69 @@ class FlattradeBroker(BrokerBase):
             logger.error(f"Order placement failed: {ret.get('emsg')}")
             return None
 
+    def submit_order(self, symbol: str, quantity: int, price: float, transaction_type: str, order_type: str, product: str, exchange: str = 'NSE', tag: str = "strategy") -> Future:
+        """Queues an order for coalesced placement.
+
+        Orders submitted within `MAX_ORDER_WAIT` seconds of each other (up to
+        `MAX_ORDER_BATCH`) are sent together, so the legs of a basket go out
+        concurrently instead of one round-trip after another. Arguments are
+        the same as for `place_order`.
+
+        Returns:
+            Future: Resolves to the order ID, or None if placement failed.
+        """
+        if self._order_drainer is None:
+            self._order_drainer = Thread(target=self._drain_orders, daemon=True)
+            self._order_drainer.start()
+        future = Future()
+        self._order_queue.put((future, (symbol, quantity, price, transaction_type, order_type, product, exchange, tag)))
+        return future
+
+    def place_orders(self, orders: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Places several orders concurrently and waits for all of them.
+
+        Args:
+            orders (List[Dict[str, Any]]): Keyword arguments for `place_order`,
+                one dictionary per order.
+
+        Returns:
+            List[Optional[str]]: The order IDs, in the order of `orders`.
+        """
+        futures = [self.submit_order(**order) for order in orders]
+        return [future.result() for future in futures]
+
+    def _drain_orders(self):
+        """Collects queued orders into batches and places each batch concurrently.
+
+        The Noren API has no bulk order endpoint, so a batch is fanned out
+        over the broker's order pool. The drainer does not wait for the
+        batch: each order's future resolves as soon as its own call returns,
+        and the next batch is collected meanwhile.
+        """
+        while True:
+            batch = [self._order_queue.get()]
+            deadline = time.monotonic() + self.MAX_ORDER_WAIT
+            while len(batch) < self.MAX_ORDER_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._order_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            for future, args in batch:
+                self._order_pool.submit(self._place_queued_order, future, args)
+
+    def _place_queued_order(self, future: Future, args: Tuple):
+        """Places one queued order and resolves its future."""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.place_order(*args))
+        except Exception as e:
+            future.set_exception(e)
+
     def get_positions(self) -> Optional[List[Dict[str, Any]]]:
         """Retrieves the current positions."""
         return self.api.get_positions()
@@ -242,20 +622,68 @@ class FlattradeBroker(BrokerBase):
 
     # --- WebSocket Methods ---
 
-    def connect_websocket(self):
+    def connect_websocket(self, block: bool = True, timeout: float = 10.0):
         """Initializes and connects the WebSocket client.
 
         This method assigns all the `on_*` callbacks and starts the
-        connection.
+        connection. A daemon thread is started to drain the tick buffer
+        filled by `on_ticks` in batches.
+
+        While the socket handshake is in flight, a lightweight REST call
+        warms the pooled HTTP connection so the first order does not pay
+        the TLS setup cost.
+
+        Args:
+            block (bool): If True, wait until the WebSocket is open before
+                returning. Defaults to True.
+            timeout (float): The maximum number of seconds to wait for the
+                connection when `block` is True. Defaults to 10.0.
         """
+        if self._tick_flusher is None:
+            self._tick_flusher = Thread(target=self._flush_ticks, daemon=True)
+            self._tick_flusher.start()
+        self._connected.clear()
         self.api.start_websocket(
             order_update_callback=self.on_order_update,
             subscribe_callback=self.on_ticks,
-            socket_open_callback=self.on_connect,
+            socket_open_callback=self._on_ws_open,
             socket_close_callback=self.on_close,
             socket_error_callback=self.on_error
         )
 
+        try:
+            self.api.get_limits()
+        except Exception as e:
+            logger.warning(f"HTTP pre-warm call failed: {e}")
+
+        if block and not self._connected.wait(timeout=timeout):
+            logger.warning(f"WebSocket did not open within {timeout} seconds.")
+
+    def _on_ws_open(self):
+        """Internal callback that records the open event and delegates to `on_connect`."""
+        self._connected.set()
+        self.on_connect()
+
+    def _resolve_instruments(self, symbols: List[str], exchange: str) -> List[str]:
+        """Resolves symbols to `exchange|token` instrument strings.
+
+        Token lookups are network-bound, so they are issued concurrently
+        from a small thread pool. Symbols that cannot be resolved are skipped.
+
+        Args:
+            symbols (List[str]): A list of trading symbols.
+            exchange (str): The exchange of the symbols.
+
+        Returns:
+            List[str]: The instrument strings, in the order of `symbols`.
+        """
+        if not symbols:
+            return []
+        with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+            tokens = list(executor.map(lambda symbol: self._get_token(exchange, symbol), symbols))
+        prefix = exchange + "|"
+        return [prefix + token for token in tokens if token]
+
     def subscribe(self, symbols: List[str], exchange: str = 'NSE'):
         """Subscribes to real-time data for a list of symbols.
 
@@ -263,12 +691,7 @@ class FlattradeBroker(BrokerBase):
             symbols (List[str]): A list of trading symbols.
             exchange (str): The exchange of the symbols. Defaults to 'NSE'.
         """
-        instrument_list = []
-        for symbol in symbols:
-            token = self._get_token(exchange, symbol)
-            if token:
-                instrument_list.append(f"{exchange}|{token}")
-
+        instrument_list = self._resolve_instruments(symbols, exchange)
         if instrument_list:
             self.api.subscribe(instrument_list)
 
@@ -279,20 +702,46 @@ class FlattradeBroker(BrokerBase):
             symbols (List[str]): A list of trading symbols to unsubscribe from.
             exchange (str): The exchange of the symbols. Defaults to 'NSE'.
         """
-        instrument_list = []
-        for symbol in symbols:
-            token = self._get_token(exchange, symbol)
-            if token:
-                instrument_list.append(f"{exchange}|{token}")
-
+        instrument_list = self._resolve_instruments(symbols, exchange)
         if instrument_list:
             self.api.unsubscribe(instrument_list)
 
     # --- WebSocket Callbacks ---
 
+    def _flush_ticks(self):
+        """Drains the tick buffer every `TICK_FLUSH_INTERVAL` seconds.
+
+        Ticks are popped off the deque (safe against concurrent appends from
+        the WebSocket thread) and handed to `on_tick_batch` in one call. An
+        exception from `on_tick_batch` is logged and that batch skipped, so
+        the flusher keeps running.
+        """
+        while True:
+            time.sleep(self.TICK_FLUSH_INTERVAL)
+            try:
+                batch = []
+                while self._tick_buffer:
+                    batch.append(self._tick_buffer.popleft())
+                if batch:
+                    self.on_tick_batch(batch)
+            except Exception:
+                logger.exception("Error processing tick batch")
+
     def on_ticks(self, ticks):
-        """Placeholder for handling incoming ticks."""
-        logger.info(f"Ticks: {ticks}")
+        """Buffers incoming ticks for batched processing off the WebSocket thread.
+
+        When the buffer is full the oldest tick is evicted; evictions are
+        counted, with a warning on the first and every 1024th.
+        """
+        if len(self._tick_buffer) == self.TICK_BUFFER_SIZE:
+            self._ticks_evicted += 1
+            if self._ticks_evicted & 1023 == 1:
+                logger.warning(f"Tick buffer is full; evicted {self._ticks_evicted} ticks so far.")
+        self._tick_buffer.append(ticks)
+
+    def on_tick_batch(self, batch: List[Any]):
+        """Placeholder for handling a batch of buffered ticks."""
+        logger.info(f"Received {len(batch)} ticks.")
 
     def on_connect(self):
         """Placeholder for actions to be taken on WebSocket connection."""
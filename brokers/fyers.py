@@ -1,24 +1,33 @@
 import os
 import sys
-import json
+import atexit
+import socket
 import time
 import threading
-from datetime import datetime, timedelta
+import queue
+import warnings
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import parse_qs, urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pyotp
+import numpy as np
 import base64
-import subprocess
 import logging
 import hashlib
 from fyers_apiv3 import fyersModel
 from fyers_apiv3.FyersWebsocket import data_ws
-from ratelimit import limits, sleep_and_retry
 import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 
 # Import base broker classes
 from .base import BrokerBase
+from utils import json_dumps, json_loads, prewarm_connection
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
@@ -27,8 +36,81 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+class TokenBucket:
+    """A token bucket rate limiter driven by the monotonic clock.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Each
+    call reserves one token, going into debt if none is available; the debt
+    tells the caller how long to wait, so concurrent callers are paced
+    instead of retried.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): The maximum number of tokens the bucket holds.
+        tokens (float): Tokens currently available (negative while in debt).
+        last (float): The monotonic time of the last refill.
+    """
+    __slots__ = ('rate', 'capacity', 'tokens', 'last')
+
+    def __init__(self, calls: int, period: float):
+        """Initializes a full bucket allowing `calls` per `period` seconds."""
+        self.rate = calls / period
+        self.capacity = float(calls)
+        self.tokens = float(calls)
+        self.last = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Takes one token and returns the seconds to wait before using it."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
 # Rate limiting configuration for Fyers API
 # Per Second: 10, Per Minute: 200, Per Day: 100000
+_RATE_LIMIT_BUCKETS = (
+    TokenBucket(calls=10, period=1),
+    TokenBucket(calls=200, period=60),
+    TokenBucket(calls=100000, period=86400),
+)
+_rate_limit_lock = threading.Lock()
+
+def _acquire_rate_limit():
+    """Blocks until one more Fyers API call fits within all rate limits."""
+    with _rate_limit_lock:
+        now = time.monotonic()
+        wait = max([bucket.reserve(now) for bucket in _RATE_LIMIT_BUCKETS])
+    if wait > 0:
+        time.sleep(wait)
+
+# Bounds for the adaptive per-second limit (AIMD: additive increase on
+# success, multiplicative decrease when Fyers answers 429).
+_MAX_CALLS_PER_SECOND = 10.0
+_MIN_CALLS_PER_SECOND = 1.0
+
+def _adapt_rate_limit(response: requests.Response, *args, **kwargs) -> None:
+    """Session response hook that adapts the per-second rate limit.
+
+    A 429 halves the per-second rate and drops any banked tokens, so the
+    next callers are paced immediately; every successful response raises
+    the rate by one call per second, up to the documented Fyers limit.
+
+    Only responses on sessions from `_create_http_session` (login and
+    margin calls) are seen here; `fyers_model` traffic such as history and
+    quotes does not adapt the rate, though it is still paced by it.
+    """
+    bucket = _RATE_LIMIT_BUCKETS[0]
+    if response.status_code == 429:
+        with _rate_limit_lock:
+            bucket.rate = max(_MIN_CALLS_PER_SECOND, bucket.rate * 0.5)
+            bucket.tokens = min(bucket.tokens, 0.0)
+            rate = bucket.rate
+        logger.warning(f"Fyers API throttled (429); reducing to {rate:.1f} calls/s")
+    elif response.ok and bucket.rate < _MAX_CALLS_PER_SECOND:
+        with _rate_limit_lock:
+            bucket.rate = min(_MAX_CALLS_PER_SECOND, bucket.rate + 1.0)
+
 def fyers_rate_limit(func):
     """A decorator to enforce Fyers API rate limits.
 
@@ -37,7 +119,8 @@ def fyers_rate_limit(func):
     - 200 calls per minute
     - 100,000 calls per day
 
-    If a limit is exceeded, the decorator will pause the execution and retry.
+    If a limit is exceeded, the decorator will pause the execution until
+    the call fits within all limits.
 
     Args:
         func (callable): The function to be rate-limited.
@@ -47,16 +130,117 @@ def fyers_rate_limit(func):
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logger.debug(f"Rate limiting applied to {func.__name__}")
+        _acquire_rate_limit()
         return func(*args, **kwargs)
-    
-    # Apply the rate limiting decorators
-    wrapper = sleep_and_retry(limits(calls=10, period=1))(wrapper)
-    wrapper = sleep_and_retry(limits(calls=200, period=60))(wrapper)
-    wrapper = sleep_and_retry(limits(calls=100000, period=86400))(wrapper)
-    
+
     return wrapper
 
+def _response_json(response: requests.Response) -> Any:
+    """Decodes a response body straight from its raw bytes."""
+    return json_loads(response.content)
+
+# Resends of a throttled (429) request before its response is returned as-is
+_MAX_THROTTLE_RETRIES = 3
+# Upper bound on a single wait between resends, whatever Retry-After says
+_MAX_THROTTLE_WAIT = 30.0
+
+def _retry_after_seconds(response: requests.Response, attempt: int) -> float:
+    """Returns how long to wait before resending a throttled request.
+
+    Honours a `Retry-After` header in seconds or as an HTTP date, and falls
+    back to exponential backoff when the header is missing or invalid.
+    """
+    header = response.headers.get("Retry-After")
+    delay = None
+    if header:
+        try:
+            delay = float(header)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(header) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+    if delay is None:
+        delay = 0.3 * 2 ** attempt
+    return min(max(0.0, delay), _MAX_THROTTLE_WAIT)
+
+class _ThrottleRetrySession(requests.Session):
+    """A session that resends requests Fyers answered with 429.
+
+    Every response, throttled or not, first passes through the session's
+    hooks, so `_adapt_rate_limit` lowers the rate on the first 429. The
+    request is then resent up to `_MAX_THROTTLE_RETRIES` times, waiting for
+    `Retry-After` and taking a fresh rate-limit token before each resend.
+    """
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        attempt = 0
+        while True:
+            response = super().send(request, **kwargs)
+            if response.status_code != 429 or attempt >= _MAX_THROTTLE_RETRIES:
+                return response
+            delay = _retry_after_seconds(response, attempt)
+            response.close()
+            attempt += 1
+            logger.warning(f"Fyers API throttled (429); resending in {delay:.2f}s (attempt {attempt}/{_MAX_THROTTLE_RETRIES})")
+            time.sleep(delay)
+            _acquire_rate_limit()
+
+def _create_http_session() -> requests.Session:
+    """Creates a keep-alive HTTP session for Fyers REST calls.
+
+    Reusing one session lets consecutive calls to the same Fyers host share
+    a TCP/TLS connection instead of handshaking on every request. Transient
+    5xx responses are retried with exponential backoff by urllib3. Throttled
+    (429) responses are not retried there: each one first lowers the
+    adaptive per-second rate limit (see `_adapt_rate_limit`), then the
+    session resends the request (see `_ThrottleRetrySession`).
+
+    Returns:
+        requests.Session: A session with a small per-host connection pool.
+    """
+    retry = Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"]),
+        raise_on_status=False,
+    )
+    session = _ThrottleRetrySession()
+    session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=16))
+    session.hooks["response"].append(_adapt_rate_limit)
+    return session
+
+@functools.lru_cache(maxsize=8)
+def _app_id_hash(client_id: str, secret_key: str) -> str:
+    """Returns the SHA-256 `appIdHash` for an app, computed once per credential pair."""
+    return hashlib.sha256(f"{client_id}:{secret_key}".encode('utf-8')).hexdigest()
+
+# Environment variables required by the Fyers TOTP login flow
+_CREDENTIAL_VARS = (
+    'BROKER_ID', 'BROKER_TOTP_KEY', 'BROKER_TOTP_PIN',
+    'BROKER_API_KEY', 'BROKER_API_SECRET', 'BROKER_TOTP_REDIDRECT_URI',
+)
+
+@functools.lru_cache(maxsize=1)
+def _fyers_credentials() -> Dict[str, str]:
+    """Reads the Fyers credentials from the environment once per process.
+
+    Raises:
+        KeyError: If a required variable is missing (the failure is not
+            cached, so a later call can succeed once it is set).
+    """
+    return {name: os.environ[name] for name in _CREDENTIAL_VARS}
+
+def _warn_use_curl(method: str):
+    """Warns that the removed `use_curl` option was passed to a margin method."""
+    warnings.warn(
+        f"FyersBroker.{method}: `use_curl` is deprecated and ignored; "
+        "requests always go through the pooled HTTP session.",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+
 def getEncodedString(string: str) -> str:
     """Encodes a string to a Base64 ASCII string.
 
@@ -83,6 +267,12 @@ class FyersBroker(BrokerBase):
         data_type (str): The type of data to subscribe to via WebSocket.
         ws (data_ws.FyersDataSocket): The WebSocket instance.
     """
+    # Seconds between writes of the API call counter to FyersModel.json
+    CONTEXT_FLUSH_INTERVAL = 30
+    # Seconds to wait on direct REST calls before giving up
+    REST_TIMEOUT = 10
+    # Symbols per WebSocket subscribe request
+    SUBSCRIBE_BATCH_SIZE = 100
 
     def __init__(
         self,
@@ -111,13 +301,23 @@ class FyersBroker(BrokerBase):
                 WebSocket messages. Defaults to None.
         """
         logger.info("Initializing FyersBroker...")
+        # Shared keep-alive session for authentication and margin requests
+        self._http = _create_http_session()
+        self._totp = None  # pyotp.TOTP generator, built on first authenticate
         self.access_token, self.auth_response_data = self.authenticate()
         self.fyers_model = fyersModel.FyersModel(
-            client_id=os.environ["BROKER_API_KEY"],
+            client_id=_fyers_credentials()["BROKER_API_KEY"],
             token=self.access_token,
             is_async=False,
             log_path=os.getcwd(),
         )
+        # Worker pool for fanning out independent REST calls (e.g., per-symbol margins)
+        self._rest_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fyers-rest")
+        # Headers for direct REST calls made through the shared session
+        self._rest_headers = {
+            "Authorization": f"{self.fyers_model.client_id}:{self.access_token}",
+            "Content-Type": "application/json",
+        }
         self._init_context()
 
         # WebSocket parameters
@@ -132,13 +332,13 @@ class FyersBroker(BrokerBase):
 
         # === Begin Benchmark Tracking Changes ===
         self._benchmark = False
-        # Dictionary to count messages per ticker in the current second.
-        self.ticker_second_counts = {}
+        # Symbols of received messages, drained once per second by _aggregate_second.
+        self._tick_q = queue.SimpleQueue()
         # Cumulative accumulators over a 1-minute window.
         self.minute_seconds_count = 0
         self.cumulative_distinct_tickers = 0
-        self.cumulative_ticker_counts = {}
-        # Lock to avoid race conditions.
+        self.cumulative_ticker_counts = Counter()
+        # Guards the cumulative accumulators shared with _benchmark_minute.
         self.benchmark_lock = threading.Lock()
         if self._benchmark:
             # Start background threads to aggregate per-second counts and print per-minute averages.
@@ -166,40 +366,48 @@ class FyersBroker(BrokerBase):
         }
         try:
             # Required env vars
-            fy_id = os.environ['BROKER_ID']
-            totp_key = os.environ['BROKER_TOTP_KEY']
-            pin = os.environ['BROKER_TOTP_PIN']
-            client_id = os.environ['BROKER_API_KEY']
-            secret_key = os.environ['BROKER_API_SECRET']
-            redirect_uri = os.environ['BROKER_TOTP_REDIDRECT_URI']
+            credentials = _fyers_credentials()
+            fy_id = credentials['BROKER_ID']
+            totp_key = credentials['BROKER_TOTP_KEY']
+            pin = credentials['BROKER_TOTP_PIN']
+            client_id = credentials['BROKER_API_KEY']
+            secret_key = credentials['BROKER_API_SECRET']
+            redirect_uri = credentials['BROKER_TOTP_REDIDRECT_URI']
             response_type = "code" # Should be always `code`
             grant_type = "authorization_code" # Should be always `authorization_code`
+            http = self._http
+            # Steps 4-5 go to api-t1; open that connection while steps 1-3 run on api-t2.
+            threading.Thread(target=prewarm_connection, args=(http, "https://api-t1.fyers.in/"), daemon=True).start()
             # Step 1: Send login OTP
             URL_SEND_LOGIN_OTP = "https://api-t2.fyers.in/vagator/v2/send_login_otp_v2"
-            res = requests.post(url=URL_SEND_LOGIN_OTP, json={
+            res = _response_json(http.post(url=URL_SEND_LOGIN_OTP, json={
                 "fy_id": getEncodedString(fy_id),
                 "app_id": "2"
-            }).json()
-            if datetime.now().second % 30 > 27:
-                time.sleep(5)
+            }))
             # Step 2: Verify OTP
+            if self._totp is None:
+                self._totp = pyotp.TOTP(totp_key)
+            # Near the end of a 30s window, wait for the next window to start
+            # rather than send a code that may expire in flight.
+            remaining = self._totp.interval - (time.time() % self._totp.interval)
+            if remaining < 2:
+                time.sleep(remaining)
+            otp = self._totp.now()
             URL_VERIFY_OTP = "https://api-t2.fyers.in/vagator/v2/verify_otp"
-            res2 = requests.post(url=URL_VERIFY_OTP, json={
+            res2 = _response_json(http.post(url=URL_VERIFY_OTP, json={
                 "request_key": res["request_key"],
-                "otp": pyotp.TOTP(totp_key).now()
-            }).json()
+                "otp": otp
+            }))
             # Step 3: Verify PIN
-            ses = requests.Session()
             URL_VERIFY_OTP2 = "https://api-t2.fyers.in/vagator/v2/verify_pin_v2"
             payload2 = {
                 "request_key": res2["request_key"],
                 "identity_type": "pin",
                 "identifier": getEncodedString(pin)
             }
-            res3 = ses.post(url=URL_VERIFY_OTP2, json=payload2).json()
-            ses.headers.update({
-                'authorization': f"Bearer {res3['data']['access_token']}"
-            })
+            res3 = _response_json(http.post(url=URL_VERIFY_OTP2, json=payload2))
+            # Sent per request so the bearer token does not stick to the shared session
+            bearer = {'authorization': f"Bearer {res3['data']['access_token']}"}
             # Step 4: Get auth code
             TOKENURL = "https://api-t1.fyers.in/api/v3/token"
             payload3 = {
@@ -214,26 +422,25 @@ class FyersBroker(BrokerBase):
                 "response_type": "code",
                 "create_cookie": True
             }
-            res4 = ses.post(url=TOKENURL, json=payload3).json()
+            res4 = _response_json(http.post(url=TOKENURL, json=payload3, headers=bearer))
             parsed = urlparse(res4['Url'])
             auth_code = parse_qs(parsed.query)['auth_code'][0]
             # Step 5: Exchange auth code for access token
-            import hashlib
             url = 'https://api-t1.fyers.in/api/v3/validate-authcode'
-            checksum_input = f"{client_id}:{secret_key}"
-            app_id_hash = hashlib.sha256(checksum_input.encode('utf-8')).hexdigest()
+            app_id_hash = _app_id_hash(client_id, secret_key)
             payload = {
                 'grant_type': grant_type,
                 'appIdHash': app_id_hash,
                 'code': auth_code
             }
             headers = {
+                **bearer,
                 'Content-Type': 'application/json',
                 'Accept': 'application/json'
             }
-            response = ses.post(url, headers=headers, json=payload, timeout=30.0)
+            response = http.post(url, headers=headers, json=payload, timeout=30.0)
             response.raise_for_status()
-            auth_data = response.json()
+            auth_data = _response_json(response)
             if auth_data.get('s') == 'ok':
                 access_token = auth_data.get('access_token')
                 if not access_token:
@@ -253,6 +460,10 @@ class FyersBroker(BrokerBase):
                 error_msg = auth_data.get('message', 'Authentication failed')
                 response_data['message'] = f"API error: {error_msg}"
                 return None, response_data
+        except ValueError as e:
+            # JSON decode errors (stdlib and orjson) subclass ValueError
+            response_data['message'] = f"Authentication failed: invalid JSON response ({e})"
+            return None, response_data
         except Exception as e:
             response_data['message'] = f"Authentication failed: {str(e)}"
             return None, response_data
@@ -261,80 +472,140 @@ class FyersBroker(BrokerBase):
     # === Begin Benchmark Aggregation Method ===
     def _aggregate_second(self):
         """Accumulate per-second data and update cumulative counters."""
+        # Sleep to fixed monotonic deadlines so wake-up latency does not accumulate.
+        next_deadline = time.monotonic()
         while True:
-            time.sleep(1)  # Wait for one second interval
-            with self.benchmark_lock:
-                # Snapshot and reset the per-second ticker counts.
-                current_counts = self.ticker_second_counts
-                self.ticker_second_counts = {}
+            next_deadline += 1.0
+            time.sleep(max(0.0, next_deadline - time.monotonic()))  # Wait for one second interval
+            # Drain the symbols queued during this second (bounded, so a busy
+            # feed cannot keep this loop running into the next second).
+            current_counts = Counter()
+            for _ in range(self._tick_q.qsize()):
+                current_counts[self._tick_q.get_nowait()] += 1
             # Compute distinct tickers in this second.
             distinct_this_second = len(current_counts)
             with self.benchmark_lock:
                 self.minute_seconds_count += 1
                 self.cumulative_distinct_tickers += distinct_this_second
                 # For each ticker, update cumulative count.
-                for ticker, count in current_counts.items():
-                    self.cumulative_ticker_counts[ticker] = (
-                        self.cumulative_ticker_counts.get(ticker, 0) + count
-                    )
+                self.cumulative_ticker_counts.update(current_counts)
 
     # === End Benchmark Aggregation Method ===
 
     # === Begin Benchmark Reporting Method ===
     def _benchmark_minute(self):
         """Every minute, compute and print the average distinct tickers per second and average messages per ticker per second."""
+        next_deadline = time.monotonic()
         while True:
-            time.sleep(60)  # One-minute interval
+            next_deadline += 60.0
+            time.sleep(max(0.0, next_deadline - time.monotonic()))  # One-minute interval
+            # Swap the accumulators out under the lock; format and print outside it
+            # so the report I/O never blocks _aggregate_second.
             with self.benchmark_lock:
-                if self.minute_seconds_count == 0:
-                    continue  # Avoid division by zero
-                avg_distinct = (
-                    self.cumulative_distinct_tickers / self.minute_seconds_count
-                )
-                report_lines = []
-                report_lines.append("Benchmark (over last minute):")
-                report_lines.append(
-                    f"Average distinct tickers per second: {avg_distinct:.2f}"
-                )
-                tickers_counts = 0
-                total_counts = 0
-                for ticker, total_count in self.cumulative_ticker_counts.items():
-                    if total_count > 0:
-                        tickers_counts += 1
-                        total_counts += total_count
-
-                avg_msgs = total_counts / self.minute_seconds_count
-                report_lines.append(
-                    f"Summary Records per Second\t {avg_msgs:.2f} from {tickers_counts} tickers - {total_counts} records in {self.minute_seconds_count} seconds"
-                )
-                print("\n" + "\n".join(report_lines))
+                seconds = self.minute_seconds_count
+                distinct_total = self.cumulative_distinct_tickers
+                ticker_counts = self.cumulative_ticker_counts
                 # Reset cumulative counters for the next minute.
                 self.minute_seconds_count = 0
                 self.cumulative_distinct_tickers = 0
-                self.cumulative_ticker_counts = {}
+                self.cumulative_ticker_counts = Counter()
+            if seconds == 0:
+                continue  # Avoid division by zero
+            # Counts only ever grow from positive increments, so every key is a ticker seen this minute.
+            tickers_counts = len(ticker_counts)
+            total_counts = sum(ticker_counts.values())
+            print(
+                f"\nBenchmark (over last minute):\n"
+                f"Average distinct tickers per second: {distinct_total / seconds:.2f}\n"
+                f"Summary Records per Second\t {total_counts / seconds:.2f} from {tickers_counts} tickers - {total_counts} records in {seconds} seconds"
+            )
 
     # === End Benchmark Reporting Method ===
 
     def _init_context(self):
-        """Initialize context for tracking API calls."""
-        if os.path.exists("FyersModel.json"):
-            with open("FyersModel.json", "r") as f:
-                self.context = json.load(f)
-            if self.context.get("DATE") != str(datetime.now().date()):
-                self._create_context()
-        else:
+        """Initialize context for tracking API calls.
+
+        The call counter is kept in memory and written to disk by a daemon
+        thread every `CONTEXT_FLUSH_INTERVAL` seconds, and once more at exit.
+        """
+        self._context_lock = threading.Lock()
+        # Serializes context file writes (flush thread, rollover and atexit)
+        self._context_write_lock = threading.RLock()
+        self._context_dirty = False
+        self._refresh_today()
+        try:
+            with open("FyersModel.json", "rb") as f:
+                self.context = json_loads(f.read())
+        except (OSError, ValueError):
+            # Missing or corrupt context file: start a fresh one.
+            self.context = {}
+        if not isinstance(self.context, dict) or self.context.get("DATE") != self._today:
             self._create_context()
+        threading.Thread(target=self._flush_context_periodically, daemon=True).start()
+        atexit.register(self._flush_context)
 
     def _create_context(self):
-        self.context = {"TOTAL_API_CALLS": 0, "DATE": str(datetime.now().date())}
-        with open("FyersModel.json", "w") as f:
-            json.dump(self.context, f)
+        self.context = {"TOTAL_API_CALLS": 0, "DATE": self._today}
+        self._write_context(self.context)
+
+    def _write_context(self, context: Dict[str, Any]):
+        """Atomically replaces the context file with `context`.
+
+        Writes within this process are serialized by `_context_write_lock`,
+        and the temporary file is named per process, so no two writers share
+        it; readers see either the old or the new file.
+        """
+        tmp_path = f"FyersModel.json.{os.getpid()}.tmp"
+        with self._context_write_lock:
+            with open(tmp_path, "wb") as f:
+                f.write(json_dumps(context))
+            os.replace(tmp_path, "FyersModel.json")
+
+    def _flush_context(self):
+        """Writes the context to disk if it changed since the last flush."""
+        # Held across snapshot and write so an older snapshot never lands last
+        with self._context_write_lock:
+            with self._context_lock:
+                if not self._context_dirty:
+                    return
+                snapshot = dict(self.context)
+                self._context_dirty = False
+            self._write_context(snapshot)
+
+    def _flush_context_periodically(self):
+        """Flushes the context every `CONTEXT_FLUSH_INTERVAL` seconds."""
+        while True:
+            time.sleep(self.CONTEXT_FLUSH_INTERVAL)
+            try:
+                self._flush_context()
+            except OSError as e:
+                logger.error(f"Error saving FyersModel context: {e}")
+
+    def _refresh_today(self):
+        """Caches today's date string and the epoch time at which it rolls over."""
+        today = datetime.now().date()
+        self._today = str(today)
+        self._day_rollover = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
 
     def update_context(self):
-        self.context["TOTAL_API_CALLS"] += 1
-        self.context["DATE"] = str(datetime.now().date())
-        with open("FyersModel.json", "w") as f:
-            json.dump(self.context, f)
+        rolled_over = False
+        with self._context_lock:
+            if time.time() >= self._day_rollover:
+                self._refresh_today()
+                rolled_over = True
+            self.context["TOTAL_API_CALLS"] += 1
+            self.context["DATE"] = self._today
+            self._context_dirty = True
+        if rolled_over:
+            # Persist the new date right away instead of waiting for the timer.
+            # This runs on API-calling threads, so a failed write must not
+            # surface from an unrelated call; the periodic flush retries it.
+            try:
+                self._flush_context()
+            except OSError as e:
+                logger.error(f"Error saving FyersModel context: {e}")
+                with self._context_lock:
+                    self._context_dirty = True
 
     def get_access_token(self) -> Optional[str]:
         """Returns the authenticated access token.
@@ -345,12 +616,12 @@ class FyersBroker(BrokerBase):
         return self.access_token
 
     # REST-based data retrieval methods
-    @fyers_rate_limit
-    def get_history(self, symbol: str, resolution: str, start_date: str, end_date: str, oi_flag: bool = False) -> Dict[str, Any]:
+    def get_history(self, symbol: str, resolution: str, start_date: str, end_date: str, oi_flag: bool = False, as_numpy: bool = False) -> Dict[str, Any]:
         """Retrieves historical data by breaking requests into smaller chunks.
 
         This method handles Fyers API limitations by automatically splitting
         the date range into smaller intervals based on the data resolution.
+        Chunks are fetched concurrently, paced by the Fyers rate limits.
 
         Args:
             symbol (str): The trading symbol (e.g., "NSE:SBIN-EQ").
@@ -358,6 +629,9 @@ class FyersBroker(BrokerBase):
             start_date (str): The start date in "YYYY-MM-DD" format.
             end_date (str): The end date in "YYYY-MM-DD" format.
             oi_flag (bool): Whether to fetch open interest data. Defaults to False.
+            as_numpy (bool): If True, return the candles as a single float64
+                `numpy.ndarray` of shape (N, columns) instead of a list of
+                lists. Defaults to False.
 
         Returns:
             Dict[str, Any]: A dictionary containing the combined historical
@@ -368,9 +642,9 @@ class FyersBroker(BrokerBase):
             f"NSE:{symbol}-EQ" if not symbol.startswith("NSE") else symbol
         )
 
-        # Convert string dates to datetime objects
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        # Parse the ISO dates (cheaper than strptime)
+        start_dt = date.fromisoformat(start_date)
+        end_dt = date.fromisoformat(end_date)
 
         # Determine chunk size based on resolution
         if resolution in ["D", "1D"]:
@@ -383,58 +657,78 @@ class FyersBroker(BrokerBase):
             # For minute resolutions: up to 100 days per request
             max_days = 100
 
-        # Initialize result container
-        all_candles = []
-
-        # Break the date range into chunks
-        current_start = start_dt
-        while current_start <= end_dt:
-            # Calculate end date for this chunk
-            current_end = min(current_start + timedelta(days=max_days - 1), end_dt)
-
-            # Format dates for API request
-            chunk_start = current_start.strftime("%Y-%m-%d")
-            chunk_end = current_end.strftime("%Y-%m-%d")
-
-            logger.info(
-                f"Fetching {formatted_symbol} data from {chunk_start} to {chunk_end} with resolution {resolution}"
+        # Break the date range into chunks of `max_days`, computed in one pass
+        chunk_span = timedelta(days=max_days)
+        n_chunks = max(0, -(-((end_dt - start_dt).days + 1) // max_days))
+        chunk_ranges = [
+            (
+                (start_dt + i * chunk_span).isoformat(),
+                min(start_dt + (i + 1) * chunk_span - timedelta(days=1), end_dt).isoformat(),
             )
-
-            # Prepare request parameters
-            data_headers = {
-                "symbol": formatted_symbol,
-                "resolution": resolution,
-                "date_format": "1",
-                "range_from": chunk_start,
-                "range_to": chunk_end,
-                "cont_flag": "1"
-            }
-            if oi_flag:
-                data_headers["oi_flag"] = "1"
-            # Make the API call
-            chunk_data = self.fyers_model.history(data_headers)
-            self.update_context()
-
-            # Check if we got valid data
-            if "candles" in chunk_data and len(chunk_data["candles"]) > 0:
-                all_candles.extend(chunk_data["candles"])
-            else:
-                # logger.warning(f"No data returned for {formatted_symbol} from {chunk_start} to {chunk_end}")
-                pass
-            # Add a small delay to avoid rate limiting
-            time.sleep(0.5)
-
-            # Move to next chunk
-            current_start = current_end + timedelta(days=1)
+            for i in range(n_chunks)
+        ]
+
+        # Fetch chunks concurrently; each chunk request takes a rate-limit token.
+        # The pool stays under the 10/s limit so a full round of chunks can be in flight at once.
+        with ThreadPoolExecutor(max_workers=min(8, max(1, len(chunk_ranges)))) as executor:
+            futures = [
+                executor.submit(self._fetch_history_chunk, formatted_symbol, resolution, chunk_start, chunk_end, oi_flag)
+                for chunk_start, chunk_end in chunk_ranges
+            ]
+            # Collect in submission order so candles stay chronological
+            candle_chunks = [candles for candles in (future.result() for future in futures) if candles]
 
         # Return combined result
-        if not all_candles:
+        if not candle_chunks:
             # logger.warning(f"No historical data returned for {symbol} from {start_date} to {end_date}.")
-            return {"s": "no_data", "candles": []}
+            # Candles are [timestamp, open, high, low, close, volume] plus OI when requested
+            return {"s": "no_data", "candles": np.empty((0, 7 if oi_flag else 6), dtype=np.float64) if as_numpy else []}
 
+        if as_numpy:
+            all_candles = np.concatenate([np.asarray(chunk, dtype=np.float64) for chunk in candle_chunks], axis=0)
+        else:
+            all_candles = list(itertools.chain.from_iterable(candle_chunks))
         return {"s": "ok", "candles": all_candles}
     
-    @fyers_rate_limit
+    def _fetch_history_chunk(self, formatted_symbol: str, resolution: str, chunk_start: str, chunk_end: str, oi_flag: bool) -> List[List[Any]]:
+        """Fetches the candles for one date chunk on behalf of `get_history`.
+
+        Args:
+            formatted_symbol (str): The exchange-qualified trading symbol.
+            resolution (str): The timeframe resolution.
+            chunk_start (str): The chunk start date in "YYYY-MM-DD" format.
+            chunk_end (str): The chunk end date in "YYYY-MM-DD" format.
+            oi_flag (bool): Whether to fetch open interest data.
+
+        Returns:
+            List[List[Any]]: The candles for the chunk, or an empty list.
+        """
+        logger.info(
+            f"Fetching {formatted_symbol} data from {chunk_start} to {chunk_end} with resolution {resolution}"
+        )
+
+        # Prepare request parameters
+        data_headers = {
+            "symbol": formatted_symbol,
+            "resolution": resolution,
+            "date_format": "1",
+            "range_from": chunk_start,
+            "range_to": chunk_end,
+            "cont_flag": "1"
+        }
+        if oi_flag:
+            data_headers["oi_flag"] = "1"
+        # Make the API call
+        _acquire_rate_limit()
+        chunk_data = self.fyers_model.history(data_headers)
+        self.update_context()
+
+        # Check if we got valid data
+        if "candles" in chunk_data and len(chunk_data["candles"]) > 0:
+            return chunk_data["candles"]
+        # logger.warning(f"No data returned for {formatted_symbol} from {chunk_start} to {chunk_end}")
+        return []
+
     def get_option_chain(self, data: dict, strikecount: int = 5) -> Dict[str, Any]:
         """Retrieves the option chain for a given underlying symbol.
 
@@ -446,13 +740,13 @@ class FyersBroker(BrokerBase):
         Returns:
             Dict[str, Any]: The option chain data from the Fyers API.
         """
+        _acquire_rate_limit()
         data["strikecount"] = strikecount
         result = self.fyers_model.optionchain(data)
         self.update_context()
         return result
     
 
-    @fyers_rate_limit
     def get_quotes(self, data: dict) -> Dict[str, Any]:
         """Retrieves real-time quotes for one or more symbols.
 
@@ -462,131 +756,127 @@ class FyersBroker(BrokerBase):
         Returns:
             Dict[str, Any]: The quote data from the Fyers API.
         """
+        _acquire_rate_limit()
         result = self.fyers_model.quotes(data)
         self.update_context()
         return result
 
-    @fyers_rate_limit
-    def get_margin(self, symbols: list, use_curl: bool = True) -> Dict[str, Any]:
+    def get_margin(self, symbols: list, use_curl: Optional[bool] = None) -> Dict[str, Any]:
         """Calculates and retrieves margin details for a list of symbols.
 
+        Per-symbol margin requests run concurrently on the broker's REST pool,
+        paced by the Fyers rate limits and sent over the shared keep-alive
+        session.
+
         Args:
             symbols (list): A list of trading symbols.
-            use_curl (bool): If True, uses cURL for the request; otherwise,
-                uses the requests library. Defaults to True.
+            use_curl (Optional[bool]): Deprecated and ignored; kept so existing
+                callers do not break. Passing it emits a DeprecationWarning.
 
         Returns:
             Dict[str, Any]: A dictionary containing margin information for each
                             symbol or an error message.
         """
+        if use_curl is not None:
+            _warn_use_curl("get_margin")
+        # Paces the quotes call; each margin request takes its own token
+        _acquire_rate_limit()
         url = "https://api-t1.fyers.in/api/v3/multiorder/margin"
-        headers = {
-            "Authorization": f"{os.environ['BROKER_API_KEY']}:{self.access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = self._rest_headers
         data = {"symbols": ",".join(symbols)}
-        fyers = fyersModel.FyersModel(
-            client_id=os.environ["BROKER_API_KEY"], token=self.access_token, is_async=False, log_path=""
-        )
-        MARGIN_DICT = {}
         # while True:
-        response_q = fyers.quotes(data=data)
-        for i, symbol in enumerate(symbols):
-            order_template = [
-                {
-                    "symbol": symbol,
-                    "qty": 1,
-                    "side": 1,
-                    "type": 2,
-                    "productType": "INTRADAY",
-                    "limitPrice": 0.0,
-                    "stopLoss": 0.0,
-                    "stopPrice": 0.0,
-                    "takeProfit": 0.0,
-                }
-            ]
+        response_q = self.fyers_model.quotes(data=data)
+        items = [(symbol, url, headers) for symbol in symbols]
+        margin_totals = []
+        for margin_total, error in self._rest_pool.map(self._fetch_margin_one, items):
+            if error is not None:
+                return {"error": error}
+            margin_totals.append(margin_total)
+
+        # Price-to-margin ratio for every symbol in one vectorized division;
+        # symbols with a missing price or margin fall back to 1.
+        last_prices = np.fromiter(
+            (self._quote_last_price(response_q, i) for i in range(len(symbols))),
+            dtype=np.float64, count=len(symbols),
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = last_prices / np.asarray(margin_totals, dtype=np.float64)
+        margins = np.where(np.isfinite(ratios), np.round(ratios), 1).astype(np.int64)
+        MARGIN_DICT = dict(zip(symbols, margins.tolist()))
+        return MARGIN_DICT
+
+    @staticmethod
+    def _quote_last_price(response_q: Dict[str, Any], i: int) -> float:
+        """Returns the last traded price of the i-th quote, or NaN if unavailable."""
+        try:
+            return float(response_q["d"][i]["v"]["lp"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return float("nan")
 
-            payload = json.dumps({"data": order_template})
-            if use_curl:
-                curl_command = [
-                    "curl",
-                    "--location",
-                    "--request",
-                    "POST",
-                    url,
-                    "--header",
-                    f"Authorization: {headers['Authorization']}",
-                    "--header",
-                    "Content-Type: application/json",
-                    "--data-raw",
-                    payload,
-                ]
-
-                try:
-                    result = subprocess.run(
-                        curl_command, capture_output=True, text=True, check=True
-                    )
-                    try:
-                        MARGIN_DICT[symbol] = round(
-                            response_q["d"][i]["v"]["lp"]
-                            / json.loads(result.stdout)["data"]["margin_total"]
-                        )
-                    except:
-                        MARGIN_DICT[symbol] = 1
-                except subprocess.CalledProcessError as e:
-                    return {"error": e.stderr}
+    def _fetch_margin_one(self, item: Tuple[str, str, Dict[str, str]]) -> Tuple[float, Optional[str]]:
+        """Fetches the margin for a single symbol on behalf of `get_margin`.
 
-            else:
-                try:
-                    response = requests.post(url, headers=headers, data=payload)
-                    response.raise_for_status()
-                    MARGIN_DICT[symbol] = round(
-                        response_q["d"][i]["v"]["lp"]
-                        / response.json()["data"]["margin_total"]
-                    )
-                except requests.exceptions.RequestException as e:
-                    return {"error": str(e)}
-            time.sleep(1)
-        return MARGIN_DICT
+        Args:
+            item (Tuple): The symbol, the margin URL and the request headers.
+
+        Returns:
+            Tuple[float, Optional[str]]: The symbol's total margin (NaN if the
+                response has none), and an error message if the request failed.
+        """
+        symbol, url, headers = item
+        order_template = [
+            {
+                "symbol": symbol,
+                "qty": 1,
+                "side": 1,
+                "type": 2,
+                "productType": "INTRADAY",
+                "limitPrice": 0.0,
+                "stopLoss": 0.0,
+                "stopPrice": 0.0,
+                "takeProfit": 0.0,
+            }
+        ]
+
+        payload = json_dumps({"data": order_template})
+        _acquire_rate_limit()
+        try:
+            response = self._http.post(url, headers=headers, data=payload, timeout=self.REST_TIMEOUT)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            return float("nan"), str(e)
+        try:
+            return float(_response_json(response)["data"]["margin_total"]), None
+        except (KeyError, IndexError, TypeError, ValueError):
+            return float("nan"), None
 
 
-    @fyers_rate_limit
-    def get_span_margin(self, order_data: List[Dict[str, Any]], use_curl: bool = False) -> Dict[str, Any]:
+    def get_span_margin(self, order_data: List[Dict[str, Any]], use_curl: Optional[bool] = None) -> Dict[str, Any]:
         """Calculates span and exposure margin for a list of orders.
 
         Args:
             order_data (List[Dict[str, Any]]): A list of order details.
-            use_curl (bool): If True, uses cURL for the request. Defaults to False.
+            use_curl (Optional[bool]): Deprecated and ignored; kept so existing
+                callers do not break. Passing it emits a DeprecationWarning.
 
         Returns:
             Dict[str, Any]: The API response with margin details or an error.
         """
+        if use_curl is not None:
+            _warn_use_curl("get_span_margin")
+        _acquire_rate_limit()
         url = "https://api.fyers.in/api/v2/span_margin"
-        headers = {
-            "Authorization": f"{self.fyers_model.client_id}:{self.access_token}",
-            "Content-Type": "application/json",
-        }
-        payload = json.dumps({"data": order_data})
+        headers = self._rest_headers
+        payload = json_dumps({"data": order_data})
         try:
-            if use_curl:
-                curl_command = [
-                    "curl", "--location", "--request", "POST", url,
-                    "--header", f"Authorization: {headers['Authorization']}",
-                    "--header", "Content-Type: application/json",
-                    "--data-raw", payload,
-                ]
-                result = subprocess.run(curl_command, capture_output=True, text=True, check=True)
-                return json.loads(result.stdout)
-            else:
-                response = requests.post(url, headers=headers, data=payload)
-                response.raise_for_status()
-                return response.json()
+            response = self._http.post(url, headers=headers, data=payload, timeout=self.REST_TIMEOUT)
+            response.raise_for_status()
+            return _response_json(response)
         except Exception as e:
             logger.error(f"Error in FyersBroker.get_span_margin: {e}")
             return {"error": str(e)}
 
-    @fyers_rate_limit
-    def get_multiorder_margin(self, order_data: List[Dict[str, Any]], use_curl: bool = False) -> Dict[str, Any]:
+    def get_multiorder_margin(self, order_data: List[Dict[str, Any]], use_curl: Optional[bool] = None) -> Dict[str, Any]:
         """Calculates the margin required for a list of orders.
 
         This method uses the Fyers Multiorder Margin API to calculate the
@@ -594,31 +884,22 @@ class FyersBroker(BrokerBase):
 
         Args:
             order_data (List[Dict[str, Any]]): A list of order details.
-            use_curl (bool): If True, uses cURL for the request. Defaults to False.
+            use_curl (Optional[bool]): Deprecated and ignored; kept so existing
+                callers do not break. Passing it emits a DeprecationWarning.
 
         Returns:
             Dict[str, Any]: The API response with margin details or an error.
         """
+        if use_curl is not None:
+            _warn_use_curl("get_multiorder_margin")
+        _acquire_rate_limit()
         url = "https://api-t1.fyers.in/api/v3/multiorder/margin"
-        headers = {
-            "Authorization": f"{self.fyers_model.client_id}:{self.access_token}",
-            "Content-Type": "application/json",
-        }
-        payload = json.dumps({"data": order_data})
+        headers = self._rest_headers
+        payload = json_dumps({"data": order_data})
         try:
-            if use_curl:
-                curl_command = [
-                    "curl", "--location", "--request", "POST", url,
-                    "--header", f"Authorization: {headers['Authorization']}",
-                    "--header", "Content-Type: application/json",
-                    "--data-raw", payload,
-                ]
-                result = subprocess.run(curl_command, capture_output=True, text=True, check=True)
-                return json.loads(result.stdout)
-            else:
-                response = requests.post(url, headers=headers, data=payload)
-                response.raise_for_status()
-                return response.json()
+            response = self._http.post(url, headers=headers, data=payload, timeout=self.REST_TIMEOUT)
+            response.raise_for_status()
+            return _response_json(response)
         except Exception as e:
             logger.error(f"Error in FyersBroker.get_multiorder_margin: {e}")
             return {"error": str(e)}
@@ -644,36 +925,54 @@ class FyersBroker(BrokerBase):
             on_message=self._on_ws_message,
         )
         self.ws.connect()
+        self._tune_ws_socket()
         return self.ws
 
+    def _tune_ws_socket(self):
+        """Sets TCP_NODELAY and SO_KEEPALIVE on the WebSocket's TCP socket.
+
+        Disabling Nagle's algorithm stops small frames from being held back
+        waiting for delayed ACKs. The socket is reached through the SDK's
+        internal websocket-client objects, so any layout change in
+        fyers_apiv3 is tolerated and simply skips the tuning.
+        """
+        try:
+            ws_app = getattr(self.ws, "_FyersDataSocket__ws_object", None) or getattr(self.ws, "ws", None)
+            sock = ws_app.sock.sock
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        except (AttributeError, OSError) as e:
+            logger.debug(f"Could not tune WebSocket socket options: {e}")
+
     def _on_ws_message(self, message):
         """
         Internal callback for handling WebSocket messages.
         """
         # Process the message; if a data handler is provided, pass the data.
-        print(message)
+        if isinstance(message, (bytes, bytearray, str)):
+            message = json_loads(message)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("tick %s", message)
         if "symbol" in message:
             if self._benchmark:
-                with self.benchmark_lock:
-                    self.ticker_second_counts[message["symbol"]] = (
-                        self.ticker_second_counts.get(message["symbol"], 0) + 1
-                    )
+                self._tick_q.put(message["symbol"])
             if self.data_handler:
                 self.data_handler.data_queue.put(message)
-            else:
-                # print(message)
-                pass
 
     def _on_ws_close(self, message):
         """
         Internal callback for handling WebSocket closure.
         """
-        print("WebSocket connection closed:", message)
+        logger.info("WebSocket connection closed: %s", message)
 
     def _on_ws_open(self):
         """
         Internal callback for handling WebSocket connection open event.
         """
-        print("WebSocket connection opened. Subscribing to symbols.")
-        self.ws.subscribe(symbols=self.symbols, data_type=self.data_type)
+        logger.info("WebSocket connection opened. Subscribing to symbols.")
+        # The TCP socket only exists once the connection is open (and is new after a reconnect).
+        self._tune_ws_socket()
+        # Subscribe in batches to keep each subscribe frame small.
+        for i in range(0, len(self.symbols), self.SUBSCRIBE_BATCH_SIZE):
+            self.ws.subscribe(symbols=self.symbols[i:i + self.SUBSCRIBE_BATCH_SIZE], data_type=self.data_type)
         self.ws.keep_running()
@@ -2,20 +2,177 @@ import logging
 import os, sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Set, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
 import hashlib, pyotp
+import time
+import queue
+import random
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from brokers.base import BrokerBase
 from kiteconnect import KiteConnect, KiteTicker
+from kiteconnect.exceptions import NetworkException
+import numpy as np
 import pandas as pd
 from threading import Thread
+import multiprocessing as mp
 
 from logger import logger
+from utils import prewarm_connection
 
 
 load_dotenv()
 
+# Kite's trading-day boundaries are in Indian Standard Time, whatever the host's zone
+_IST = ZoneInfo("Asia/Kolkata")
+
+# Credentials, read once after loading .env
+_API_KEY = os.getenv('BROKER_API_KEY')
+_API_SECRET = os.getenv('BROKER_API_SECRET')
+_BROKER_ID = os.getenv('BROKER_ID')
+_TOTP_KEY = os.getenv('BROKER_TOTP_KEY')
+_PASSWORD = os.getenv('BROKER_PASSWORD')
+
+
+def _create_kite(api_key: Optional[str]) -> KiteConnect:
+    """Creates a KiteConnect client with a pooled keep-alive HTTP session.
+
+    Quote, order and position calls then reuse open TLS connections to the
+    Kite API instead of handshaking on every request. Connection failures
+    are retried with a short backoff; non-idempotent requests such as order
+    placement are never re-sent after a read error.
+
+    Args:
+        api_key (Optional[str]): The Kite Connect API key.
+
+    Returns:
+        KiteConnect: The client instance.
+    """
+    kite = KiteConnect(api_key=api_key)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=Retry(total=3, backoff_factor=0.1))
+    kite.reqsession.mount("https://", adapter)
+    return kite
+
+
+def _never_connected(error: Exception) -> bool:
+    """Returns True if a failed request provably never reached the server.
+
+    Only connect-stage failures qualify; a dropped or timed-out connection
+    after the request was sent may still have been processed upstream.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+# Columnar layout for tick batches shipped as arrays (see `ticks_to_array`)
+TICK_DTYPE = np.dtype([
+    ("instrument_token", np.uint32),
+    ("last_price", np.float64),
+    ("volume_traded", np.uint64),
+    ("total_buy_quantity", np.uint64),
+    ("total_sell_quantity", np.uint64),
+    ("oi", np.uint64),
+    ("exchange_timestamp", "datetime64[s]"),
+])
+
+
+def ticks_to_array(ticks: List[Dict[str, Any]]) -> np.ndarray:
+    """Packs a batch of KiteTicker tick dicts into a NumPy structured array.
+
+    One contiguous array pickles and crosses a process boundary far more
+    cheaply than a list of dicts, and its columns can be used directly in
+    vectorized indicator math. Fields missing from a tick (e.g., volume on
+    index ticks) are stored as 0, and a missing timestamp as NaT.
+
+    Args:
+        ticks (List[Dict[str, Any]]): The ticks received from KiteTicker.
+
+    Returns:
+        np.ndarray: An array of `TICK_DTYPE` with one row per tick.
+    """
+    nat = np.datetime64("NaT")
+    return np.array(
+        [
+            (
+                tick["instrument_token"],
+                tick.get("last_price", 0.0),
+                tick.get("volume_traded", 0),
+                tick.get("total_buy_quantity", 0),
+                tick.get("total_sell_quantity", 0),
+                tick.get("oi", 0),
+                tick.get("exchange_timestamp") or nat,
+            )
+            for tick in ticks
+        ],
+        dtype=TICK_DTYPE,
+    )
+
+
+def _ws_process_entry(api_key: str, access_token: str, symbols: List[int], mode: str, out_queue, as_array: bool = False):
+    """Runs a KiteTicker in a dedicated process and forwards ticks to a queue.
+
+    The ticker's reactor owns this process, so CPU work in the strategy
+    process (which holds its own GIL) cannot delay tick reception. If
+    `out_queue` is full, the batch is dropped and counted (as
+    `DataDispatcher` does) rather than raising inside the ticker callback.
+
+    Args:
+        api_key (str): The Kite Connect API key.
+        access_token (str): The access token from an authenticated session.
+        symbols (List[int]): The instrument tokens to subscribe to.
+        mode (str): The KiteTicker streaming mode (e.g., `KiteTicker.MODE_FULL`).
+        out_queue (multiprocessing.Queue): The queue each tick batch is put on.
+        as_array (bool): If True, each batch is put as a `TICK_DTYPE` array
+            (see `ticks_to_array`) instead of a list of dicts.
+    """
+    kite_ws = KiteTicker(api_key=api_key, access_token=access_token)
+    # Batches dropped because `out_queue` was full
+    dropped = 0
+    pid = os.getpid()
+
+    def on_ticks(ws, ticks):
+        nonlocal dropped
+        try:
+            out_queue.put_nowait(ticks_to_array(ticks) if as_array else ticks)
+        except queue.Full:
+            # The consumer is lagging: drop this batch rather than stall the reactor
+            dropped += 1
+            if dropped & 1023 == 1:
+                logger.warning(f"Ticker process {pid}: tick queue is full; dropped {dropped} batches so far.")
+
+    def on_connect(ws, response):
+        logger.info(f"Ticker process {pid}: connected, subscribing {len(symbols)} tokens")
+        ws.subscribe(symbols)
+        ws.set_mode(mode, symbols)
+
+    def on_close(ws, code, reason):
+        logger.info(f"Ticker process {pid}: connection closed: {code} - {reason}")
+
+    def on_error(ws, code, reason):
+        logger.error(f"Ticker process {pid}: connection error: {code} - {reason}")
+
+    def on_reconnect(ws, attempts_count):
+        logger.warning(f"Ticker process {pid}: reconnecting, attempt {attempts_count}")
+
+    def on_noreconnect(ws):
+        logger.error(f"Ticker process {pid}: reconnect failed; {len(symbols)} tokens are no longer streaming.")
+
+    kite_ws.on_ticks = on_ticks
+    kite_ws.on_connect = on_connect
+    kite_ws.on_close = on_close
+    kite_ws.on_error = on_error
+    kite_ws.on_reconnect = on_reconnect
+    kite_ws.on_noreconnect = on_noreconnect
+    kite_ws.connect(threaded=False)
+
 
 # --- Zerodha Broker ---
 class ZerodhaBroker(BrokerBase):
@@ -31,6 +188,36 @@ class ZerodhaBroker(BrokerBase):
         kite_ws (KiteTicker): An instance of the Kite Ticker for WebSocket data.
         symbols (list): A list of instrument tokens to subscribe to via WebSocket.
     """
+    # Local cache of the daily instrument dump (see `download_instruments`)
+    INSTRUMENTS_CACHE_FILE = os.path.join("artifacts", "zerodha_instruments.pkl")
+    # Hour (IST) at which Kite publishes the day's instrument dump
+    INSTRUMENTS_REFRESH_HOUR = 8
+    # Compact dtypes for the instrument list: low-cardinality text columns as
+    # categoricals, integer ids and lot sizes as 32-bit integers
+    _INSTRUMENT_DTYPES = {
+        "instrument_token": "uint32",
+        "lot_size": "uint32",
+        "exchange": "category",
+        "segment": "category",
+        "instrument_type": "category",
+    }
+    # Seconds a quote is reused before `get_quote` asks Kite again
+    QUOTE_CACHE_TTL = 0.2
+    # Attempts `place_order` makes before giving up on transient network errors
+    ORDER_MAX_ATTEMPTS = 5
+    # Order statuses that mean an order will never execute
+    _DEAD_ORDER_STATUSES = frozenset(("REJECTED", "CANCELLED"))
+    # KiteTicker callbacks wired to the same-named methods by `connect_websocket`
+    _WS_CALLBACKS = ('on_ticks', 'on_connect', 'on_order_update', 'on_close', 'on_error', 'on_reconnect', 'on_noreconnect')
+    # Kite allows 3 WebSocket connections per API key (3000 tokens each);
+    # `connect_websocket_process` opens one per shard of up to WS_SHARD_SIZE tokens
+    WS_MAX_CONNECTIONS = 3
+    WS_SHARD_SIZE = 1000
+    # Order parameter names accepted by `place_order`, mapped to Kite constants
+    _ORDER_TYPE_MAP = {"LIMIT": KiteConnect.ORDER_TYPE_LIMIT, "MARKET": KiteConnect.ORDER_TYPE_MARKET}
+    _TRANSACTION_TYPE_MAP = {"BUY": KiteConnect.TRANSACTION_TYPE_BUY, "SELL": KiteConnect.TRANSACTION_TYPE_SELL}
+    _VARIETY_MAP = {"REGULAR": KiteConnect.VARIETY_REGULAR}
+
     def __init__(self, without_totp: bool):
         """Initializes the ZerodhaBroker.
 
@@ -41,9 +228,11 @@ class ZerodhaBroker(BrokerBase):
         super().__init__()
         self.without_totp = without_totp
         self.kite, self.auth_response_data = self.authenticate()
-        self.kite_ws = KiteTicker(api_key=os.getenv('BROKER_API_KEY'), access_token=self.auth_response_data["access_token"])
+        self.kite_ws = KiteTicker(api_key=_API_KEY, access_token=self.auth_response_data["access_token"])
         self.tick_counter = 0
         self.symbols = []
+        # Recent quotes keyed by "EXCHANGE:SYMBOL": (monotonic fetch time, response)
+        self._quote_cache = {}
         
     def authenticate(self) -> Tuple[KiteConnect, Dict[str, Any]]:
         """Authenticates with the Zerodha Kite API.
@@ -60,17 +249,19 @@ class ZerodhaBroker(BrokerBase):
         Raises:
             Exception: If authentication fails at any step.
         """
-        api_key = os.getenv('BROKER_API_KEY')
-        api_secret = os.getenv('BROKER_API_SECRET')
-        broker_id = os.getenv('BROKER_ID')
-        totp_secret = os.getenv('BROKER_TOTP_KEY')
-        password = os.getenv('BROKER_PASSWORD')
+        api_key = _API_KEY
+        api_secret = _API_SECRET
+        broker_id = _BROKER_ID
+        totp_secret = _TOTP_KEY
+        password = _PASSWORD
 
         if self.without_totp:
-            kite = KiteConnect(api_key=os.getenv('BROKER_API_KEY'))
+            kite = _create_kite(api_key)
             print(f"Please Login to Zerodha and get the request token from the URL.\n {kite.login_url()} \nThen paste the request token here:")
             request_token = input("Request Token: ")
-            resp = kite.generate_session(request_token, os.environ['BROKER_API_SECRET'])
+            if not api_secret:
+                raise Exception("Missing BROKER_API_SECRET environment variable.")
+            resp = kite.generate_session(request_token, api_secret)
             return kite, resp
         
 
@@ -78,6 +269,11 @@ class ZerodhaBroker(BrokerBase):
             raise Exception("Missing one or more required environment variables.")
 
         session = requests.Session()
+        kite = _create_kite(api_key)
+        # Steps 3 and 4 go to kite.trade and api.kite.trade; open those connections
+        # while login and 2FA run on kite.zerodha.com.
+        Thread(target=prewarm_connection, args=(session, "https://kite.trade/"), daemon=True).start()
+        Thread(target=prewarm_connection, args=(kite.reqsession, "https://api.kite.trade/"), daemon=True).start()
 
         # Step 1: Login 
         login_url = "https://kite.zerodha.com/api/login"
@@ -104,7 +300,6 @@ class ZerodhaBroker(BrokerBase):
         if not twofa_data.get("data"):
             raise Exception(f"2FA failed: {twofa_data}")
 
-        kite = KiteConnect(api_key=os.getenv('BROKER_API_KEY'))
         # Step 3: Get request_token from redirect
         connect_url = f"https://kite.trade/connect/login?api_key={api_key}"
         connect_resp = session.get(connect_url, allow_redirects=True)
@@ -112,7 +307,7 @@ class ZerodhaBroker(BrokerBase):
             raise Exception("Failed to get request_token from redirect URL.")
         request_token = connect_resp.url.split("request_token=")[1].split("&")[0]
 
-        resp = kite.generate_session(request_token, os.environ['BROKER_API_SECRET'])
+        resp = kite.generate_session(request_token, api_secret)
         
         return kite, resp
     
@@ -124,19 +319,24 @@ class ZerodhaBroker(BrokerBase):
         """
         return self.kite.orders()
     
-    def get_quote(self, symbol: str, exchange: str) -> Dict[str, Any]:
+    def get_quote(self, symbol: str, exchange: Optional[str] = None) -> Dict[str, Any]:
         """Retrieves a real-time quote for a given symbol.
 
         Args:
-            symbol (str): The trading symbol.
-            exchange (str): The exchange where the symbol is traded (e.g., "NSE").
+            symbol (str): The trading symbol, either exchange-qualified
+                (e.g., "NSE:RELIANCE") or bare (e.g., "RELIANCE").
+            exchange (Optional[str]): The exchange where the symbol is traded
+                (e.g., "NSE"). Required only when `symbol` is not qualified.
 
         Returns:
-            Dict[str, Any]: The quote data from the Kite API.
+            Dict[str, Any]: The quote data from the Kite API, keyed by the
+                exchange-qualified symbol.
         """
-        if ":" not in symbol:   
+        if ":" not in symbol:
+            if exchange is None:
+                raise ValueError(f"Exchange is required for unqualified symbol: {symbol}")
             symbol = exchange + ":" + symbol
-        return self.kite.quote(symbol)
+        return self._cached_quote(symbol)
     
     def place_gtt_order(self, symbol: str, quantity: int, price: float, transaction_type: str, order_type: str, exchange: str, product: str, tag: str = "Unknown") -> int:
         """Places a Good Till Triggered (GTT) order.
@@ -173,13 +373,21 @@ class ZerodhaBroker(BrokerBase):
             "price": price,
             "tag": tag
         }
-        last_price = self.get_quote(symbol, exchange)[exchange + ":" + symbol]['last_price']
+        full_symbol = f"{exchange}:{symbol}"
+        last_price = self.get_quote(full_symbol)[full_symbol]['last_price']
         order_id = self.kite.place_gtt(trigger_type=self.kite.GTT_TYPE_SINGLE, tradingsymbol=symbol, exchange=exchange, trigger_values=[price], last_price=last_price, orders=[order_obj])
         return order_id['trigger_id']
     
     def place_order(self, symbol: str, quantity: int, price: float, transaction_type: str, order_type: str, variety: str, exchange: str, product: str, tag: str = "Unknown") -> int:
         """Places a regular trading order.
 
+        Requests that never connected are retried with backoff. After any
+        other network failure the order may already be with Kite, so it is
+        re-sent only if the order book holds no live order with the same
+        exchange, symbol, side, quantity and tag that was not already there
+        before the first attempt. If that earlier snapshot could not be read,
+        the order is not re-sent.
+
         Args:
             symbol (str): The trading symbol.
             quantity (int): The number of shares.
@@ -197,62 +405,129 @@ class ZerodhaBroker(BrokerBase):
         Raises:
             ValueError: If the order, transaction, or variety type is invalid.
         """
-        if order_type == "LIMIT":
-            order_type = self.kite.ORDER_TYPE_LIMIT
-        elif order_type == "MARKET":
-            order_type = self.kite.ORDER_TYPE_MARKET
-        else:
-            raise ValueError(f"Invalid order type: {order_type}")
-        
-        if transaction_type == "BUY":
-            transaction_type = self.kite.TRANSACTION_TYPE_BUY
-        elif transaction_type == "SELL":
-            transaction_type = self.kite.TRANSACTION_TYPE_SELL
-        else:
-            raise ValueError(f"Invalid transaction type: {transaction_type}")
-        
-        if variety == "REGULAR":
-            variety = self.kite.VARIETY_REGULAR
-        else:
-            raise ValueError(f"Invalid variety: {variety}")
+        try:
+            order_type = self._ORDER_TYPE_MAP[order_type]
+        except KeyError:
+            raise ValueError(f"Invalid order type: {order_type}") from None
+
+        try:
+            transaction_type = self._TRANSACTION_TYPE_MAP[transaction_type]
+        except KeyError:
+            raise ValueError(f"Invalid transaction type: {transaction_type}") from None
+
+        try:
+            variety = self._VARIETY_MAP[variety]
+        except KeyError:
+            raise ValueError(f"Invalid variety: {variety}") from None
         
         logger.info(f"Placing order for {symbol} with quantity {quantity} at {price} with order type {order_type} and transaction type {transaction_type}, variety {variety}, exchange {exchange}, product {product}, tag {tag}")
         order_attempt = 0
+        # Matching orders that predate this call. After an ambiguous failure only
+        # an order outside this set can be the one just sent; None if unknown.
         try:
-            while order_attempt < 5:
-                order_id = self.kite.place_order(
-                    variety=variety,
-                    exchange=exchange,
-                    tradingsymbol=symbol,
-                    transaction_type=transaction_type,
-                    quantity=quantity,
-                    product=product,
-                    order_type=order_type,
-                    price=price if order_type == 'LIMIT' else None,
-                    tag=tag
-                )
+            known_ids = {order["order_id"] for order in self._matching_orders(exchange, symbol, transaction_type, quantity, tag)}
+        except Exception as e:
+            logger.warning(f"Could not read the order book before placing the order: {e}")
+            known_ids = None
+        try:
+            while order_attempt < self.ORDER_MAX_ATTEMPTS:
+                try:
+                    order_id = self.kite.place_order(
+                        variety=variety,
+                        exchange=exchange,
+                        tradingsymbol=symbol,
+                        transaction_type=transaction_type,
+                        quantity=quantity,
+                        product=product,
+                        order_type=order_type,
+                        price=price if order_type == 'LIMIT' else None,
+                        tag=tag
+                    )
+                except (requests.exceptions.RequestException, NetworkException) as e:
+                    order_attempt += 1
+                    logger.warning(f"Order placement attempt {order_attempt} failed: {e}")
+                    if not _never_connected(e):
+                        # The request may have reached Kite: re-send only if no new such order exists
+                        if known_ids is None:
+                            logger.error("Order placement failed: order may have been placed; not re-sending")
+                            return -1
+                        order_id = self._find_new_order(exchange, symbol, transaction_type, quantity, tag, known_ids)
+                        if order_id is not None:
+                            logger.info(f"Order placed: {order_id}")
+                            return order_id
+                    if order_attempt < self.ORDER_MAX_ATTEMPTS:
+                        # Back off exponentially with jitter before retrying
+                        time.sleep(min(0.05 * 2 ** order_attempt + random.random() * 0.05, 1.0))
+                    continue
                 logger.info(f"Order placed: {order_id}")
                 return order_id
-            logger.error(f"Order placement failed after 5 attempts")
+            logger.error(f"Order placement failed after {self.ORDER_MAX_ATTEMPTS} attempts")
             return -1
         except Exception as e:
             logger.error(f"Order placement failed: {e}")
             return -1
+
+    def _matching_orders(self, exchange: str, symbol: str, transaction_type: str, quantity: int, tag: str) -> List[Dict[str, Any]]:
+        """Returns the day's orders with the given exchange, symbol, side, quantity and tag.
+
+        Raises:
+            Exception: If the order book cannot be fetched.
+        """
+        return [
+            order for order in self.kite.orders()
+            if order.get("exchange") == exchange
+            and order.get("tradingsymbol") == symbol
+            and order.get("transaction_type") == transaction_type
+            and order.get("quantity") == quantity
+            and order.get("tag") == tag
+        ]
+
+    def _find_new_order(self, exchange: str, symbol: str, transaction_type: str, quantity: int, tag: str, known_ids: Set[str]) -> Optional[str]:
+        """Looks up an order that an ambiguous `place_order` failure may have placed.
+
+        Args:
+            exchange (str): The exchange of the order.
+            symbol (str): The trading symbol of the order.
+            transaction_type (str): The Kite transaction type of the order.
+            quantity (int): The order quantity.
+            tag (str): The order tag.
+            known_ids (Set[str]): IDs of matching orders that existed before
+                the first attempt; these are never returned.
+
+        Returns:
+            Optional[str]: The ID of the latest new matching order that was not
+                rejected or cancelled, or None if there is none.
+
+        Raises:
+            Exception: If the order book cannot be fetched; the caller then
+                gives up rather than risk placing the order twice.
+        """
+        for order in reversed(self._matching_orders(exchange, symbol, transaction_type, quantity, tag)):
+            if order["order_id"] not in known_ids and order.get("status") not in self._DEAD_ORDER_STATUSES:
+                return order["order_id"]
+        return None
     
-    def get_quote(self, symbol: str) -> Dict[str, Any]:
-        """Retrieves a real-time quote for a given symbol.
+    def _cached_quote(self, symbol: str) -> Dict[str, Any]:
+        """Returns the Kite quote for `symbol`, reusing one fetched within `QUOTE_CACHE_TTL`.
 
-        Note:
-            This is a duplicate method. The other `get_quote` method includes
-            the exchange as a parameter.
+        Bursts of quote requests for the same instrument (e.g., a strategy
+        re-checking a price just before ordering) then cost one API call.
+        Each caller gets its own shallow copy of every per-symbol entry, so
+        adding or replacing fields does not affect other callers; nested
+        values such as `depth` and `ohlc` are shared and must not be modified.
 
         Args:
-            symbol (str): The trading symbol (e.g., "NSE:RELIANCE").
+            symbol (str): The exchange-qualified symbol (e.g., "NSE:RELIANCE").
 
         Returns:
             Dict[str, Any]: The quote data from the Kite API.
         """
-        return self.kite.quote(symbol)
+        now = time.monotonic()
+        fetched_at, quote = self._quote_cache.get(symbol, (0.0, None))
+        if quote is None or now - fetched_at >= self.QUOTE_CACHE_TTL:
+            quote = self.kite.quote(symbol)
+            self._quote_cache[symbol] = (now, quote)
+        return {key: dict(entry) for key, entry in quote.items()}
     
 
     def get_positions(self) -> Dict[str, List[Dict[str, Any]]]:
@@ -283,7 +558,7 @@ class ZerodhaBroker(BrokerBase):
             ws (KiteTicker): The WebSocket instance.
             ticks (List[Dict[str, Any]]): A list of ticks received.
         """
-        logger.info("Ticks: {}".format(ticks))
+        logger.debug("Ticks count=%d", len(ticks))
 
     def on_connect(self, ws: KiteTicker, response: Dict[str, Any]):
         """Handles the successful connection to the WebSocket.
@@ -309,7 +584,7 @@ class ZerodhaBroker(BrokerBase):
             ws (KiteTicker): The WebSocket instance.
             data (Dict[str, Any]): The order update data.
         """
-        logger.info("Order update : {}".format(data))
+        logger.debug("Order update : %s", data)
 
     def on_close(self, ws: KiteTicker, code: int, reason: str):
         """Handles the closing of the WebSocket connection.
@@ -354,10 +629,36 @@ class ZerodhaBroker(BrokerBase):
     def download_instruments(self):
         """Downloads the latest list of all available instruments.
 
-        The instrument list is stored in a pandas DataFrame.
+        The instrument list is stored in a pandas DataFrame. Kite publishes a
+        new list once a day, so the DataFrame is cached on disk at
+        `INSTRUMENTS_CACHE_FILE` and reused by later runs until the next
+        `INSTRUMENTS_REFRESH_HOUR` in IST, whatever the host's time zone.
         """
+        cache_file = self.INSTRUMENTS_CACHE_FILE
+        now = datetime.now(_IST)
+        refreshed_at = now.replace(hour=self.INSTRUMENTS_REFRESH_HOUR, minute=0, second=0, microsecond=0)
+        if now < refreshed_at:
+            refreshed_at -= timedelta(days=1)
+        try:
+            if os.path.getmtime(cache_file) >= refreshed_at.timestamp():
+                self.instruments_df = pd.read_pickle(cache_file)
+                logger.info(f"Loaded {len(self.instruments_df)} instruments from {cache_file}")
+                return
+        except OSError:
+            pass  # No cache yet
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable instruments cache {cache_file}: {e}")
+
         instruments = self.kite.instruments()
-        self.instruments_df = pd.DataFrame(instruments)
+        df = pd.DataFrame(instruments)
+        self.instruments_df = df.astype({col: dtype for col, dtype in self._INSTRUMENT_DTYPES.items() if col in df.columns})
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+            self.instruments_df.to_pickle(tmp_path)
+            os.replace(tmp_path, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not write instruments cache {cache_file}: {e}")
     
     def get_instruments(self) -> pd.DataFrame:
         """Returns the DataFrame of available instruments.
@@ -373,12 +674,47 @@ class ZerodhaBroker(BrokerBase):
         This method assigns all the `on_*` callbacks to the KiteTicker
         instance and starts the connection in a separate thread.
         """
-        self.kite_ws.on_ticks = self.on_ticks
-        self.kite_ws.on_connect = self.on_connect
-        self.kite_ws.on_order_update = self.on_order_update
-        self.kite_ws.on_close = self.on_close
-        self.kite_ws.on_error = self.on_error
-        self.kite_ws.on_reconnect = self.on_reconnect
-        self.kite_ws.on_noreconnect = self.on_noreconnect
+        # Bound here rather than in __init__: strategies replace these
+        # callbacks on the broker after construction.
+        for name in self._WS_CALLBACKS:
+            setattr(self.kite_ws, name, getattr(self, name))
         self.kite_ws.connect(threaded=True)
-        
+
+    def connect_websocket_process(self, out_queue, mode: str = KiteTicker.MODE_FULL, as_array: bool = False) -> List[mp.Process]:
+        """Starts the WebSocket client in separate processes.
+
+        Unlike `connect_websocket`, tick reception does not share the GIL
+        with strategy code. The user callbacks on this instance are not used;
+        every tick batch (a list of tick dicts) is put on `out_queue` instead,
+        e.g. the queue registered with `DataDispatcher.register_main_queue`.
+
+        Large subscriptions are split into shards of `WS_SHARD_SIZE` tokens,
+        each streamed over its own connection and process (at most
+        `WS_MAX_CONNECTIONS`, Kite's per-API-key limit), so no single
+        connection serializes the whole universe.
+
+        Args:
+            out_queue (multiprocessing.Queue): The queue to receive tick batches.
+            mode (str): The streaming mode for `self.symbols`. Defaults to
+                `KiteTicker.MODE_FULL`.
+            as_array (bool): If True, tick batches are shipped as NumPy
+                structured arrays of `TICK_DTYPE` rather than lists of dicts
+                (depth and OHLC are not included). Defaults to False.
+
+        Returns:
+            List[multiprocessing.Process]: The started (daemon) ticker processes.
+        """
+        symbols = list(self.symbols)
+        # Shard size grows past WS_SHARD_SIZE only when the connection cap is reached
+        n_shards = max(1, min(self.WS_MAX_CONNECTIONS, -(-len(symbols) // self.WS_SHARD_SIZE)))
+        shard_size = max(1, -(-len(symbols) // n_shards))
+        processes = []
+        for i in range(n_shards):
+            process = mp.Process(
+                target=_ws_process_entry,
+                args=(_API_KEY, self.auth_response_data["access_token"], symbols[i * shard_size:(i + 1) * shard_size], mode, out_queue, as_array),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+        return processes
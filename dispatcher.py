@@ -1,5 +1,47 @@
+import collections
+import multiprocessing
+import queue
 from logger import logger
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, List, Optional
+try:
+    import faster_fifo  # Optional: lock-free shared-memory queue when installed
+except ImportError:
+    faster_fifo = None
+
+# Raised by put_nowait when the registered queue is at capacity
+_QUEUE_FULL_ERRORS = (queue.Full,) if faster_fifo is None else (queue.Full, getattr(faster_fifo, "Full", queue.Full))
+
+
+def _put_method(q):
+    """Returns the non-blocking enqueue method of a supported queue.
+
+    A `collections.deque` is appended to directly; every other queue type
+    is expected to provide `put_nowait`.
+    """
+    return q.append if isinstance(q, collections.deque) else q.put_nowait
+
+
+def create_process_queue(max_size_bytes: int = 16 * 1024 * 1024):
+    """Creates a queue for passing market data between processes.
+
+    Uses `faster_fifo.Queue` when it is installed: it writes into a shared
+    memory ring buffer directly, with no feeder thread or OS pipe, and
+    sustains much higher message rates than `multiprocessing.Queue`, which
+    is returned otherwise. Both support `put`, `put_nowait` and `get`, so
+    either can be registered with `DataDispatcher.register_main_queue` or
+    passed to `ZerodhaBroker.connect_websocket_process`.
+
+    Args:
+        max_size_bytes (int): The ring buffer size for `faster_fifo`.
+            Defaults to 16 MB.
+
+    Returns:
+        Union[faster_fifo.Queue, multiprocessing.Queue]: The new queue.
+    """
+    if faster_fifo is not None:
+        return faster_fifo.Queue(max_size_bytes=max_size_bytes)
+    return multiprocessing.Queue()
+
 
 class DataDispatcher:
     """A centralized dispatcher for routing market data to a worker queue.
@@ -9,13 +51,16 @@ class DataDispatcher:
     producers from consumers in a trading system.
 
     Attributes:
-        _main_queue (Union[multiprocessing.Queue, queue.Queue, None]): The
-            queue where all data is dispatched. It is `None` until registered.
+        _main_queue (Union[collections.deque, queue.Queue, multiprocessing.Queue, faster_fifo.Queue, None]):
+            The queue where all data is dispatched. It is `None` until registered.
+        _dropped (int): The number of items discarded because the main queue
+            was full (the oldest queued items, evicted for newer ones).
     """
 
     def __init__(self):
         """Initializes the DataDispatcher."""
         self._main_queue = None
+        self._dropped = 0
         logger.debug("DataDispatcher initialized, awaiting main queue registration.")
 
     def register_main_queue(self, q):
@@ -24,18 +69,60 @@ class DataDispatcher:
         All data received by the `dispatch` method will be sent to this queue.
 
         Args:
-            q (Union[multiprocessing.Queue, queue.Queue]): The queue to be used
-                for dispatching data.
+            q (Union[collections.deque, queue.Queue, multiprocessing.Queue, faster_fifo.Queue]):
+                The queue to be used for dispatching data. Use a
+                `collections.deque` (optionally with `maxlen`, which evicts
+                the oldest items) when the producer and consumer run on the
+                same thread: it takes no locks, and the consumer polls it with
+                `get` or `drain`. Use `queue.Queue` across threads, and
+                `create_process_queue` across processes.
         """
         if self._main_queue is not None:
             logger.warning("Main queue is already registered. Overwriting.")
         self._main_queue = q
+        self._bind_dispatch(q)
         logger.info(f"Main queue registered for DataDispatcher.")
 
+    def _bind_dispatch(self, q):
+        """Replaces the dispatch methods with versions bound to `q`.
+
+        Once a queue is registered the None check, the `_main_queue` lookup
+        and the enqueue method lookup are the same on every call, so
+        they are resolved here once. The class methods remain the fallback
+        used before registration.
+        """
+        put_nowait = _put_method(q)
+        on_queue_full = self._on_queue_full
+
+        def dispatch(data):
+            try:
+                put_nowait(data)
+            except _QUEUE_FULL_ERRORS:
+                on_queue_full(data)
+            except Exception as e:
+                logger.error(f"Error dispatching data to main queue: {e}", exc_info=True)
+
+        def dispatch_many(items):
+            for data in items:
+                try:
+                    put_nowait(data)
+                except _QUEUE_FULL_ERRORS:
+                    on_queue_full(data)
+                except Exception as e:
+                    logger.error(f"Error dispatching data to main queue: {e}", exc_info=True)
+
+        # A batch is enqueued as a single item, exactly like one data item.
+        self.dispatch = dispatch
+        self.dispatch_batch = dispatch
+        self.dispatch_many = dispatch_many
+
     def dispatch(self, data: Dict[str, Any]):
         """Dispatches a data item to the registered main queue.
 
         If no queue is registered, an error is logged and the data is discarded.
+        The put never blocks: if a bounded queue is full the oldest queued item
+        is evicted to make room (see `_on_queue_full`), so a slow consumer
+        cannot stall the producer.
 
         Args:
             data (Dict[str, Any]): The data item to be dispatched, typically a
@@ -46,8 +133,135 @@ class DataDispatcher:
             return
 
         try:
-            self._main_queue.put(data)
-            logger.debug(f"Dispatched data to main queue.")
+            _put_method(self._main_queue)(data)
+            logger.debug("Dispatched data to main queue.")
+        except _QUEUE_FULL_ERRORS:
+            self._on_queue_full(data)
         except Exception as e:
             logger.error(f"Error dispatching data to main queue: {e}", exc_info=True)
 
+    def dispatch_batch(self, items: List[Dict[str, Any]]):
+        """Dispatches a batch of data items to the main queue in a single put.
+
+        The whole list is enqueued as one item, so the queue's lock (and, for
+        a `multiprocessing.Queue`, its pickling and pipe write) is paid once
+        per batch instead of once per tick. Consumers receive the list. Like
+        `dispatch`, the put never blocks; a full queue evicts its oldest item.
+
+        Args:
+            items (List[Dict[str, Any]]): The data items to be dispatched,
+                e.g. the list of ticks from a WebSocket callback.
+        """
+        if self._main_queue is None:
+            logger.error("Attempted to dispatch data, but no main queue has been registered.")
+            return
+
+        try:
+            _put_method(self._main_queue)(items)
+            logger.debug("Dispatched batch of %d items to main queue.", len(items))
+        except _QUEUE_FULL_ERRORS:
+            self._on_queue_full(items)
+        except Exception as e:
+            logger.error(f"Error dispatching data to main queue: {e}", exc_info=True)
+
+    def dispatch_many(self, items: List[Dict[str, Any]]):
+        """Dispatches each item of a batch to the main queue as its own entry.
+
+        Unlike `dispatch_batch`, consumers receive the items one by one; the
+        enqueue method is looked up once for the whole batch. Items
+        that do not fit in a full queue replace the oldest queued items.
+
+        Args:
+            items (List[Dict[str, Any]]): The data items to be dispatched.
+        """
+        if self._main_queue is None:
+            logger.error("Attempted to dispatch data, but no main queue has been registered.")
+            return
+
+        put_nowait = _put_method(self._main_queue)
+        for data in items:
+            try:
+                put_nowait(data)
+            except _QUEUE_FULL_ERRORS:
+                self._on_queue_full(data)
+            except Exception as e:
+                logger.error(f"Error dispatching data to main queue: {e}", exc_info=True)
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Takes the next item off the main queue.
+
+        Waits up to `timeout` seconds (indefinitely if None) for an item. A
+        `collections.deque` cannot be waited on, so it is only polled: with
+        the producer on the consumer's own thread, nothing can arrive while
+        the consumer waits.
+
+        Args:
+            timeout (Optional[float]): The maximum number of seconds to wait.
+                Defaults to None.
+
+        Returns:
+            Any: The item, e.g. a batch put by `dispatch_batch`.
+
+        Raises:
+            queue.Empty: If no item arrived in time (or a deque is empty).
+            RuntimeError: If no main queue has been registered.
+        """
+        q = self._main_queue
+        if q is None:
+            raise RuntimeError("No main queue has been registered.")
+        if isinstance(q, collections.deque):
+            try:
+                return q.popleft()
+            except IndexError:
+                raise queue.Empty from None
+        return q.get() if timeout is None else q.get(timeout=timeout)
+
+    def drain(self) -> List[Any]:
+        """Takes every item currently on the main queue without waiting.
+
+        Returns:
+            List[Any]: The items in arrival order; empty if none are queued
+                or no main queue has been registered.
+        """
+        q = self._main_queue
+        items = []
+        if q is None:
+            return items
+        if isinstance(q, collections.deque):
+            while q:
+                items.append(q.popleft())
+            return items
+        try:
+            while True:
+                items.append(q.get_nowait())
+        except queue.Empty:
+            return items
+
+    def _on_queue_full(self, data: Any):
+        """Makes room for `data` on a full main queue by evicting the oldest item.
+
+        Fresh ticks matter more than stale ones, so under back-pressure the
+        oldest queued item is discarded and `data` takes its place: a lagging
+        consumer catches up on recent prices instead of working through old
+        ones. Discarded items are counted, with a warning every 1024.
+
+        Args:
+            data (Any): The item that did not fit.
+        """
+        q = self._main_queue
+        try:
+            q.get_nowait()
+            self._count_dropped()
+        except queue.Empty:
+            pass  # The consumer freed a slot meanwhile
+        try:
+            q.put_nowait(data)
+        except _QUEUE_FULL_ERRORS:
+            # Another producer took the slot first; `data` itself is dropped
+            self._count_dropped()
+
+    def _count_dropped(self):
+        """Counts one discarded item, warning on the first and every 1024th."""
+        self._dropped += 1
+        if self._dropped & 1023 == 1:
+            logger.warning(f"Main queue is full; dropped {self._dropped} items so far.")
@@ -1,4 +1,6 @@
 import os, sys
+import atexit
+import queue
 import logging
 import logging.handlers
 
@@ -14,6 +16,12 @@ def setup_logging() -> logging.Logger:
     The file logger captures messages at the DEBUG level and above, while the
     console logger captures messages at the INFO level and above.
 
+    Both handlers run on a background QueueListener thread: the logger itself
+    only has a QueueHandler, so the caller never waits on disk or console
+    I/O. The QueueHandler still formats the message (and any exception) on
+    the calling thread, so later changes to the logged arguments cannot
+    alter the record.
+
     Returns:
         logging.Logger: The configured logger instance.
     """
@@ -34,23 +42,47 @@ def setup_logging() -> logging.Logger:
     )
     file_handler.suffix = "%Y-%m-%d"
 
-    # Define a detailed formatter: time, logger name, level, filename:line, function, process ID, message
+    # Define a formatter: time, logger name, level, message
     formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - PID:%(process)d - %(message)s",
+        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
     # Optionally add a console handler at a higher level (e.g., INFO)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - PID:%(process)d - %(message)s",
+        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+
+    # Hand records to a background thread that runs the real handlers
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    def start_listener():
+        listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)
+
+    def restart_listener_in_child():
+        # The parent still owns any records queued before the fork; drop the
+        # child's copies so they are not written twice.
+        try:
+            while True:
+                log_queue.get_nowait()
+        except queue.Empty:
+            pass
+        start_listener()
+
+    start_listener()
+    # A forked child (e.g., a ticker process) does not inherit the listener thread
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=restart_listener_in_child)
 
     logger.debug("Logging is set up.")
     return logger
@@ -1,8 +1,15 @@
+import atexit
 import json
 import os
+import queue
+import threading
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
 from logger import logger
+from utils import json_dumps, json_loads
 
 
 class OrderTracker:
@@ -12,14 +19,26 @@ class OrderTracker:
     status, and persists them to a JSON file. It ensures that order data
 is loaded upon initialization and saved whenever it changes.
 
+    Each new order is appended as one line to a JSONL journal next to the
+    JSON file, so saving costs O(1) per order. The journal is folded into
+    the pretty-printed JSON snapshot on load, by a write-behind thread
+    shortly after new orders, and at exit.
+
     Attributes:
         orders_file (str): The path to the JSON file where orders are stored.
+        journal_file (str): The path to the append-only JSONL order journal.
         _all_orders (Dict[str, Dict]): A dictionary mapping order IDs to order details.
         _current_order (Optional[Dict]): The most recently added order.
-        _order_ids_completed (List[str]): A list of completed order IDs.
-        _order_types_summary (Dict[str, int]): A summary count of completed
-                                               orders by transaction type.
+        _order_ids_completed (Dict[str, None]): Completed order IDs, in
+            completion order (a dict used as an insertion-ordered set).
+        _non_completed_ids (Dict[str, None]): Order IDs not yet completed,
+            in insertion order, maintained alongside `_all_orders`.
+        _order_types_summary (Counter): A summary count of completed orders
+                                        by transaction type.
     """
+    # Seconds the write-behind thread waits to coalesce orders into one snapshot
+    SNAPSHOT_DELAY = 5.0
+
     def __init__(self, orders_file: str = 'artifacts/orders_data.json'):
         """Initializes the OrderTracker.
 
@@ -28,70 +47,180 @@ is loaded upon initialization and saved whenever it changes.
                 Defaults to 'artifacts/orders_data.json'.
         """
         self.orders_file = orders_file
+        self.journal_file = os.path.splitext(orders_file)[0] + '.jsonl'
+        # Created once here rather than checked on every save
+        self._orders_dir = os.path.dirname(orders_file) or '.'
+        os.makedirs(self._orders_dir, exist_ok=True)
+        self._journal = None  # Append handle, opened on the first add_order
+        # Serializes order updates and journal appends with snapshot writes
+        self._persist_lock = threading.Lock()
         self._all_orders = {}       
         self._current_order = None
         self._load_orders()
-        self._order_ids_completed = []
-        self._order_types_summary = {}
+        # Read-only live view returned by `all_orders`
+        self._all_orders_view = MappingProxyType(self._all_orders)
+        # One signal per journaled order; the write-behind thread coalesces them
+        self._save_queue = queue.SimpleQueue()
+        threading.Thread(target=self._write_behind, daemon=True).start()
+        atexit.register(self.flush_snapshot)
+        self._order_ids_completed = {}
+        self._non_completed_ids = dict.fromkeys(self._all_orders)
+        self._order_types_summary = Counter()
 
     def _load_orders(self):
         """Loads orders from the JSON file into memory.
 
         This private method handles file existence checks, JSON decoding,
-        and sets the `_current_order` to the one with the most recent
-        timestamp upon loading.
+        replays orders journaled since the last snapshot, and sets the
+        `_current_order` to the one with the most recent timestamp upon
+        loading.
         """
-        os.makedirs(os.path.dirname(self.orders_file), exist_ok=True)
-
         if os.path.exists(self.orders_file) and os.path.getsize(self.orders_file) > 0:
             try:
-                with open(self.orders_file, 'r') as f:
-                    self._all_orders = json.load(f)
+                with open(self.orders_file, 'rb') as f:
+                    self._all_orders = json_loads(f.read())
                 logger.info(f"Loaded {len(self._all_orders)} orders from '{self.orders_file}'.")
-
-                if self._all_orders:
-                    latest_order = None
-                    latest_timestamp = None
-                    for order_id, order_details in self._all_orders.items():
-                        if 'timestamp' in order_details:
-                            current_ts = datetime.fromisoformat(order_details['timestamp'])
-                            if latest_timestamp is None or current_ts > latest_timestamp:
-                                latest_timestamp = current_ts
-                                latest_order = order_details
-                    self._current_order = latest_order
-                    if self._current_order:
-                        logger.info(f"Current order set to: {self._current_order.get('order_id')}")
-                    else:
-                        logger.info("No valid current order found among loaded orders.")
             except json.JSONDecodeError:
                 logger.error(f"Error decoding JSON from '{self.orders_file}'. Starting with empty orders.")
                 self._all_orders = {}
-                self._current_order = None
             except Exception as e:
                 logger.error(f"An unexpected error occurred while loading orders: {e}")
                 self._all_orders = {}
-                self._current_order = None
         else:
             logger.info(f"No existing order file found at '{self.orders_file}'. Starting fresh.")
             self._all_orders = {}
-            self._current_order = None
 
-    def _save_orders(self):
+        replayed = self._replay_journal()
+
+        self._current_order = None
+        if self._all_orders:
+            # Naive ISO-8601 timestamps sort lexicographically in chronological
+            # order (an omitted fraction sorts before any fraction of that second),
+            # so the latest order is found without parsing each timestamp.
+            self._current_order = max(
+                (order_details for order_details in self._all_orders.values() if 'timestamp' in order_details),
+                key=lambda order_details: order_details['timestamp'],
+                default=None,
+            )
+            if self._current_order:
+                logger.info(f"Current order set to: {self._current_order.get('order_id')}")
+            else:
+                logger.info("No valid current order found among loaded orders.")
+
+        if replayed:
+            # Fold the replayed orders into the snapshot so the journal starts empty.
+            self.flush_snapshot()
+
+    def _replay_journal(self) -> int:
+        """Applies the orders appended to the journal since the last snapshot.
+
+        A malformed line (e.g., one cut short by a crash) is skipped.
+
+        Returns:
+            int: The number of orders replayed.
+        """
+        if not os.path.exists(self.journal_file):
+            return 0
+        replayed = 0
+        try:
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        order_details = json_loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping malformed line in '{self.journal_file}'.")
+                        continue
+                    order_id = order_details.get('order_id') if isinstance(order_details, dict) else None
+                    if order_id:
+                        self._all_orders[order_id] = order_details
+                        replayed += 1
+        except IOError as e:
+            logger.error(f"Error reading order journal '{self.journal_file}': {e}")
+        if replayed:
+            logger.info(f"Replayed {replayed} orders from '{self.journal_file}'.")
+        return replayed
+
+    def _save_orders(self) -> bool:
         """Saves the current state of all orders to the JSON file.
 
         This private method ensures the directory exists and pretty-prints
-        the JSON for readability.
+        the JSON for readability. The file is replaced atomically, so a crash
+        mid-write never leaves a truncated snapshot.
+
+        Returns:
+            bool: True if the snapshot was written, otherwise False.
         """
         try:
-            # Ensure the directory exists before saving
-            os.makedirs(os.path.dirname(self.orders_file), exist_ok=True)
-            with open(self.orders_file, 'w') as f:
-                json.dump(self._all_orders, f, indent=4) # indent for pretty printing
+            tmp_path = f"{self.orders_file}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(json_dumps(self._all_orders, pretty=True)) # indent for pretty printing
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.orders_file)
             logger.info(f"Saved {len(self._all_orders)} orders to '{self.orders_file}'.")
+            return True
         except IOError as e:
             logger.error(f"Error saving orders to '{self.orders_file}': {e}")
         except Exception as e:
             logger.error(f"An unexpected error occurred while saving orders: {e}")
+        return False
+
+    def _append_to_journal(self, order_details: Dict) -> bool:
+        """Appends one order to the JSONL journal.
+
+        Args:
+            order_details (Dict): The order to persist.
+
+        Returns:
+            bool: True if the order was written, otherwise False.
+        """
+        try:
+            line = json_dumps(order_details) + b'\n'
+            if self._journal is None:
+                self._journal = open(self.journal_file, 'ab')
+            self._journal.write(line)
+            self._journal.flush()
+            return True
+        except IOError as e:
+            logger.error(f"Error appending order to '{self.journal_file}': {e}")
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while journaling an order: {e}")
+        return False
+
+    def flush_snapshot(self):
+        """Writes all orders to the JSON snapshot and clears the journal.
+
+        Called automatically on load (if the journal had entries), by the
+        write-behind thread, and at interpreter exit; call it directly to
+        checkpoint earlier.
+        """
+        with self._persist_lock:
+            if not self._save_orders():
+                return
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            try:
+                if os.path.exists(self.journal_file):
+                    open(self.journal_file, 'w').close()
+            except IOError as e:
+                logger.error(f"Error clearing order journal '{self.journal_file}': {e}")
+
+    def _write_behind(self):
+        """Checkpoints the snapshot in the background after new orders.
+
+        Waits for an order, then lets `SNAPSHOT_DELAY` seconds of further
+        orders accumulate, so a burst costs a single snapshot write.
+        """
+        while True:
+            self._save_queue.get()
+            time.sleep(self.SNAPSHOT_DELAY)
+            try:
+                while True:
+                    self._save_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.flush_snapshot()
 
     def add_order(self, order_details: Dict):
         """Adds a new order to the tracker and persists it.
@@ -109,18 +238,23 @@ is loaded upon initialization and saved whenever it changes.
             return
 
         if 'timestamp' not in order_details:
-            order_details['timestamp'] = datetime.now().isoformat()
+            order_details['timestamp'] = datetime.now().isoformat(timespec='microseconds')
 
         self._current_order = order_details
-        logger.info(f"Order being placed: {self._current_order}")
+        logger.info("Order being placed: %s", self._current_order)
 
         if order_id in self._all_orders:
-            logger.warning(f"Order with ID '{order_id}' already exists. Updating existing order.")
-        self._all_orders[order_id] = self._current_order
-        logger.info(f"Order '{order_id}' added/updated in in-memory dictionary.")
+            logger.warning("Order with ID '%s' already exists. Updating existing order.", order_id)
+        with self._persist_lock:
+            self._all_orders[order_id] = self._current_order
+            if order_id not in self._order_ids_completed:
+                self._non_completed_ids[order_id] = None
+            logger.info("Order '%s' added/updated in in-memory dictionary.", order_id)
+            saved = self._append_to_journal(self._current_order)
 
-        self._save_orders()
-        logger.info("Orders saved to disk.")
+        if saved:
+            logger.info("Orders saved to disk.")
+            self._save_queue.put(None)
 
 
     @property
@@ -129,9 +263,13 @@ is loaded upon initialization and saved whenever it changes.
         return self._current_order
 
     @property
-    def all_orders(self) -> Dict[str, Dict]:
-        """Returns a copy of all orders placed so far."""
-        return self._all_orders.copy()
+    def all_orders(self) -> Mapping[str, Dict]:
+        """Returns a read-only view of all orders placed so far.
+
+        The view reflects later changes; use `dict(tracker.all_orders)` for
+        an independent copy.
+        """
+        return self._all_orders_view
 
     @property
     def completed_order_ids(self) -> List[str]:
@@ -146,12 +284,12 @@ is loaded upon initialization and saved whenever it changes.
     @property
     def non_completed_order_ids(self) -> List[str]:
         """Returns a list of non-completed order IDs."""
-        return [oid for oid in self._all_orders if oid not in self._order_ids_completed]
+        return list(self._non_completed_ids)
 
     @property
     def non_completed_orders(self) -> List[Dict]:
         """Returns a list of non-completed order details."""
-        return [self._all_orders[oid] for oid in self._all_orders if oid not in self._order_ids_completed]
+        return [self._all_orders[oid] for oid in self._non_completed_ids]
 
     def get_order_by_id(self, order_id: str) -> Optional[Dict]:
         """Retrieves an order by its ID.
@@ -182,17 +320,15 @@ is loaded upon initialization and saved whenever it changes.
             bool: True if the order was successfully marked as completed,
                   False otherwise.
         """
-        if order_id in self._all_orders:
-            if order_id not in self._order_ids_completed:
-                self._order_ids_completed.append(order_id)
-                if self._all_orders[order_id]['transaction_type'] not in self._order_types_summary:
-                    self._order_types_summary[self._all_orders[order_id]['transaction_type']] = 1
-                else:
-                    self._order_types_summary[self._all_orders[order_id]['transaction_type']] += 1
-                logger.info(f"Order '{order_id}' marked as completed.")
-            else:
-                logger.info(f"Order '{order_id}' already marked as completed.")
+        order = self._all_orders.get(order_id)
+        if order is None:
+            logger.error("Order '%s' not found in the order tracker.", order_id)
+            return False
+        if order_id in self._order_ids_completed:
+            logger.info("Order '%s' already marked as completed.", order_id)
             return True
-        else:
-            logger.error(f"Order '{order_id}' not found in the order tracker.")
-            return False
\ No newline at end of file
+        self._order_ids_completed[order_id] = None
+        self._non_completed_ids.pop(order_id, None)
+        self._order_types_summary[order['transaction_type']] += 1
+        logger.info("Order '%s' marked as completed.", order_id)
+        return True
\ No newline at end of file
@@ -418,7 +418,7 @@ class SurvivorStrategy:
             "transaction_type": self.strat_var_trans_type,
             "quantity": quantity,
             "price": price,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now().isoformat(timespec='microseconds'),
         }
         
         self.order_manager.add_order(order_details)
@@ -1101,7 +1101,8 @@ PARAMETER GROUPS:
 
     # Initialize data dispatcher for handling real-time market data
     dispatcher = DataDispatcher()
-    dispatcher.register_main_queue(Queue())
+    # Bounded: when full, the oldest ticks are evicted so a lagging strategy sees fresh prices
+    dispatcher.register_main_queue(Queue(maxsize=10000))
 
     # ==========================================================================
     # SECTION 5: WEBSOCKET CALLBACK CONFIGURATION  
@@ -1116,8 +1117,8 @@ PARAMETER GROUPS:
             ws: The WebSocket instance.
             ticks (list): A list of tick data dictionaries.
         """
-        logger.debug("Received ticks: {}".format(ticks))
-        dispatcher.dispatch(ticks)
+        logger.debug("Received ticks: %s", ticks)
+        dispatcher.dispatch_batch(ticks)
 
     def on_connect(ws, response: dict):
         """Callback function for when the WebSocket connection is established.
@@ -1167,14 +1168,14 @@ PARAMETER GROUPS:
             try:
                 # STEP 1: Get market data from dispatcher queue
                 # This call blocks until new tick data arrives from websocket
-                tick_data = dispatcher._main_queue.get()
+                tick_data = dispatcher.get()
                 
                 # STEP 2: Extract the primary instrument data
                 # tick_data is a list, we process the first instrument
                 symbol_data = tick_data[0]
                 
                 # STEP 3: Optional data simulation for testing
-                # You also need to move `tick_data = dispatcher._main_queue.get()` above 
+                # You also need to move `tick_data = dispatcher.get()` above 
                 # outside of the while loop for this to work
                 # if isinstance(symbol_data, dict) and 'last_price' in symbol_data:
                 #     original_price = symbol_data['last_price']
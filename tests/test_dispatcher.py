@@ -0,0 +1,66 @@
+import collections
+import queue
+
+import pytest
+
+from dispatcher import DataDispatcher
+
+
+@pytest.mark.parametrize("main_queue", [collections.deque(), queue.Queue()], ids=["deque", "queue"])
+def test_get_and_drain_support_every_backend(main_queue):
+    dispatcher = DataDispatcher()
+    dispatcher.register_main_queue(main_queue)
+
+    dispatcher.dispatch_batch([{"last_price": 1.0}])
+    dispatcher.dispatch_many([2, 3])
+
+    assert dispatcher.get(timeout=0.1) == [{"last_price": 1.0}]
+    assert dispatcher.drain() == [2, 3]
+    assert dispatcher.drain() == []
+    with pytest.raises(queue.Empty):
+        dispatcher.get(timeout=0.01)
+
+
+def test_get_without_registered_queue_raises():
+    with pytest.raises(RuntimeError):
+        DataDispatcher().get()
+
+
+def test_full_queue_evicts_oldest_and_keeps_newest():
+    dispatcher = DataDispatcher()
+    dispatcher.register_main_queue(queue.Queue(maxsize=1))
+
+    dispatcher.dispatch_batch([1])
+    dispatcher.dispatch_batch([2])
+    dispatcher.dispatch_many([3, 4])
+
+    assert dispatcher._dropped == 3
+    assert dispatcher.drain() == [4]
+
+
+def test_queue_full_warns_on_first_drop_and_every_1024(caplog):
+    dispatcher = DataDispatcher()
+    dispatcher.register_main_queue(queue.Queue(maxsize=1))
+    dispatcher.dispatch(0)
+
+    with caplog.at_level("WARNING", logger="system"):
+        dispatcher.dispatch_many(range(1025))
+
+    assert dispatcher._dropped == 1025
+    assert [r.getMessage() for r in caplog.records if r.levelname == "WARNING"] == [
+        "Main queue is full; dropped 1 items so far.",
+        "Main queue is full; dropped 1025 items so far.",
+    ]
+    assert dispatcher.drain() == [1024]
+
+
+def test_unbound_methods_also_evict_oldest_on_full_queue():
+    dispatcher = DataDispatcher()
+    dispatcher._main_queue = queue.Queue(maxsize=1)  # registered without rebinding
+
+    DataDispatcher.dispatch(dispatcher, 1)
+    DataDispatcher.dispatch_batch(dispatcher, [2])
+    DataDispatcher.dispatch_many(dispatcher, [3])
+
+    assert dispatcher._dropped == 2
+    assert dispatcher.drain() == [3]
@@ -0,0 +1,61 @@
+import json
+import os
+import stat
+from unittest import mock
+
+import pytest
+
+flattrade = pytest.importorskip("brokers.flattrade")
+FlattradeBroker = flattrade.FlattradeBroker
+
+OK = {"stat": "Ok", "cash": "100000"}
+REJECTED = {"stat": "Not_Ok", "emsg": "Session Expired :  Invalid Session Key"}
+
+
+@pytest.fixture
+def broker(tmp_path, monkeypatch):
+    for name, value in (("BROKER_API_KEY", "key"), ("BROKER_API_SECRET", "secret"), ("BROKER_ID", "FT0001")):
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("BROKER_SESSION_TOKEN", raising=False)
+    monkeypatch.setattr(FlattradeBroker, "SESSION_FILE", str(tmp_path / "flattrade" / "session.json"))
+    broker = FlattradeBroker.__new__(FlattradeBroker)
+    broker.authenticated = False
+    broker.access_token = None
+    broker.api = mock.Mock()
+    broker._login_via_browser = mock.Mock(return_value="fresh-token")
+    return broker
+
+
+def test_browser_token_is_saved_owner_only_after_it_validates(broker):
+    broker.api.get_limits.return_value = OK
+
+    assert broker.authenticate() == "fresh-token"
+    assert broker.authenticated
+    assert stat.S_IMODE(os.stat(broker.SESSION_FILE).st_mode) == 0o600
+    with open(broker.SESSION_FILE) as f:
+        assert json.load(f)["FT0001"]["token"] == "fresh-token"
+
+
+def test_valid_cached_token_skips_browser_login(broker):
+    broker._save_session_token("FT0001", "cached-token")
+    broker.api.get_limits.return_value = OK
+
+    assert broker.authenticate() == "cached-token"
+    broker._login_via_browser.assert_not_called()
+
+
+def test_rejected_cached_token_is_discarded_and_login_runs(broker):
+    broker._save_session_token("FT0001", "revoked-token")
+    broker.api.get_limits.side_effect = [REJECTED, OK]
+
+    assert broker.authenticate() == "fresh-token"
+    broker._login_via_browser.assert_called_once()
+    assert broker._load_session_token("FT0001") == "fresh-token"
+
+
+def test_token_that_fails_validation_is_not_saved(broker):
+    broker.api.get_limits.return_value = REJECTED
+
+    assert broker.authenticate() is None
+    assert not broker.authenticated
+    assert not os.path.exists(broker.SESSION_FILE)
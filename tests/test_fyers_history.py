@@ -0,0 +1,16 @@
+from unittest import mock
+
+import pytest
+
+fyers = pytest.importorskip("brokers.fyers")
+
+
+@pytest.mark.parametrize("oi_flag, width", [(False, 6), (True, 7)])
+def test_empty_numpy_history_has_the_candle_width(oi_flag, width):
+    broker = fyers.FyersBroker.__new__(fyers.FyersBroker)
+    broker._fetch_history_chunk = mock.Mock(return_value=[])
+
+    result = broker.get_history("SBIN", "D", "2024-01-01", "2024-01-31", oi_flag=oi_flag, as_numpy=True)
+
+    assert result["s"] == "no_data"
+    assert result["candles"].shape == (0, width)
@@ -0,0 +1,120 @@
+import pytest
+
+fyers = pytest.importorskip("brokers.fyers")
+import requests
+
+
+class FakeClock:
+    """Stands in for the `time` module: monotonic time only moves on sleep."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(fyers, "time", fake)
+    return fake
+
+
+def test_bucket_goes_into_debt_once_empty(clock):
+    bucket = fyers.TokenBucket(calls=10, period=1)
+
+    assert [bucket.reserve(clock.now) for _ in range(10)] == [0.0] * 10
+    # Each call past the capacity waits one more refill interval
+    assert bucket.reserve(clock.now) == pytest.approx(0.1)
+    assert bucket.reserve(clock.now) == pytest.approx(0.2)
+    assert bucket.tokens == pytest.approx(-2.0)
+
+
+def test_bucket_refills_up_to_capacity(clock):
+    bucket = fyers.TokenBucket(calls=10, period=1)
+    for _ in range(12):
+        bucket.reserve(clock.now)
+
+    # 0.5s repays the debt of 2 and refills 3 tokens
+    assert bucket.reserve(clock.now + 0.5) == 0.0
+    assert bucket.tokens == pytest.approx(2.0)
+    # A long idle period never banks more than the capacity
+    bucket.reserve(clock.now + 60)
+    assert bucket.tokens == pytest.approx(9.0)
+
+
+def test_acquire_sleeps_for_the_tightest_bucket(clock, monkeypatch):
+    buckets = (fyers.TokenBucket(calls=10, period=1), fyers.TokenBucket(calls=12, period=60))
+    monkeypatch.setattr(fyers, "_RATE_LIMIT_BUCKETS", buckets)
+
+    for _ in range(10):
+        fyers._acquire_rate_limit()
+    assert clock.sleeps == []
+
+    fyers._acquire_rate_limit()  # 11th call: per-second bucket is empty
+    assert clock.sleeps == [pytest.approx(0.1)]
+
+    fyers._acquire_rate_limit()
+    fyers._acquire_rate_limit()  # 13th call: per-minute bucket now dominates
+    assert clock.sleeps[-1] == pytest.approx(5.0 - 0.2, abs=0.01)
+
+
+class ScriptedAdapter(requests.adapters.BaseAdapter):
+    """Answers each request with the next status code from a script."""
+
+    def __init__(self, statuses, headers=None):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.statuses[self.sent]
+        response.headers.update(self.headers)
+        response._content = b'{"s": "ok"}'
+        response.request = request
+        response.url = request.url
+        self.sent += 1
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fresh_buckets(monkeypatch):
+    buckets = (fyers.TokenBucket(calls=10, period=1), fyers.TokenBucket(calls=200, period=60))
+    monkeypatch.setattr(fyers, "_RATE_LIMIT_BUCKETS", buckets)
+    return buckets
+
+
+def test_throttled_request_is_resent_after_retry_after(clock, fresh_buckets):
+    session = fyers._create_http_session()
+    adapter = ScriptedAdapter([429, 200], headers={"Retry-After": "2"})
+    session.mount("https://", adapter)
+
+    response = session.post("https://api-t1.fyers.in/api/v3/multiorder/margin", data=b"{}")
+
+    assert response.status_code == 200
+    assert adapter.sent == 2
+    assert clock.sleeps[0] == 2.0
+    # The 429 halved the per-second rate before the successful resend added 1/s back
+    assert fresh_buckets[0].rate == 6.0
+
+
+def test_throttle_retries_are_bounded(clock, fresh_buckets):
+    session = fyers._create_http_session()
+    adapter = ScriptedAdapter([429] * 10)
+    session.mount("https://", adapter)
+
+    response = session.get("https://api-t1.fyers.in/")
+
+    assert response.status_code == 429
+    assert adapter.sent == fyers._MAX_THROTTLE_RETRIES + 1
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+import orders
+from orders import OrderTracker
+
+
+@pytest.fixture
+def tracker_factory(tmp_path, monkeypatch):
+    """Builds trackers on a temp file without the atexit flush or a timed snapshot."""
+    monkeypatch.setattr(orders.atexit, "register", lambda func: None)
+    monkeypatch.setattr(OrderTracker, "SNAPSHOT_DELAY", 3600.0)
+    orders_file = tmp_path / "orders_data.json"
+    return lambda: OrderTracker(orders_file=str(orders_file))
+
+
+def _order(order_id, timestamp):
+    return {"order_id": order_id, "transaction_type": "BUY", "timestamp": timestamp}
+
+
+def test_journal_round_trip(tracker_factory):
+    tracker = tracker_factory()
+    tracker.add_order(_order("A1", "2024-01-01T09:15:00.000001"))
+    tracker.add_order(_order("A2", "2024-01-01T09:15:00.000002"))
+
+    with open(tracker.journal_file) as f:
+        assert [json.loads(line)["order_id"] for line in f] == ["A1", "A2"]
+
+    reloaded = tracker_factory()
+    assert set(reloaded.all_orders) == {"A1", "A2"}
+    assert reloaded.current_order["order_id"] == "A2"
+    # Replayed orders are folded into the snapshot and the journal is cleared
+    with open(reloaded.orders_file) as f:
+        assert set(json.load(f)) == {"A1", "A2"}
+    with open(reloaded.journal_file) as f:
+        assert f.read() == ""
+
+
+def test_replay_skips_corrupt_last_line(tracker_factory):
+    tracker = tracker_factory()
+    tracker.add_order(_order("A1", "2024-01-01T09:15:00.000001"))
+    tracker._journal.write(b'{"order_id": "A2", "transac')  # cut short by a crash
+    tracker._journal.flush()
+
+    reloaded = tracker_factory()
+    assert list(reloaded.all_orders) == ["A1"]
+    assert reloaded.non_completed_order_ids == ["A1"]
+
+
+def test_flush_snapshot_truncates_journal(tracker_factory):
+    tracker = tracker_factory()
+    tracker.add_order(_order("A1", "2024-01-01T09:15:00.000001"))
+    tracker.flush_snapshot()
+
+    with open(tracker.orders_file) as f:
+        assert json.load(f) == {"A1": _order("A1", "2024-01-01T09:15:00.000001")}
+    with open(tracker.journal_file) as f:
+        assert f.read() == ""
+
+    # Later orders reopen the journal and append after the checkpoint
+    tracker.add_order(_order("A2", "2024-01-01T09:15:00.000002"))
+    with open(tracker.journal_file) as f:
+        assert [json.loads(line)["order_id"] for line in f] == ["A2"]
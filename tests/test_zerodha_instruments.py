@@ -0,0 +1,53 @@
+import os
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+
+zerodha = pytest.importorskip("brokers.zerodha")
+pd = pytest.importorskip("pandas")
+
+
+class FrozenDatetime(datetime):
+    """A datetime whose now() is fixed at 03:00 UTC, i.e. 08:30 IST."""
+
+    @classmethod
+    def now(cls, tz=None):
+        frozen = datetime(2024, 1, 2, 3, 0, tzinfo=timezone.utc)
+        return frozen.astimezone(tz) if tz is not None else frozen.replace(tzinfo=None)
+
+
+@pytest.fixture
+def broker(tmp_path, monkeypatch):
+    monkeypatch.setattr(zerodha, "datetime", FrozenDatetime)
+    monkeypatch.setattr(zerodha.ZerodhaBroker, "INSTRUMENTS_CACHE_FILE", str(tmp_path / "instruments.pkl"))
+    broker = zerodha.ZerodhaBroker.__new__(zerodha.ZerodhaBroker)
+    broker.kite = mock.Mock()
+    broker.kite.instruments.return_value = [{"instrument_token": 1, "tradingsymbol": "NEW", "exchange": "NFO"}]
+    return broker
+
+
+def _write_cache(path, written_at_utc):
+    pd.DataFrame([{"instrument_token": 2, "tradingsymbol": "OLD", "exchange": "NFO"}]).to_pickle(path)
+    stamp = written_at_utc.timestamp()
+    os.utime(path, (stamp, stamp))
+
+
+def test_cache_from_before_0800_ist_is_refreshed(broker):
+    # 02:00 UTC is 07:30 IST: written before today's dump was published
+    _write_cache(broker.INSTRUMENTS_CACHE_FILE, datetime(2024, 1, 2, 2, 0, tzinfo=timezone.utc))
+
+    broker.download_instruments()
+
+    broker.kite.instruments.assert_called_once()
+    assert list(broker.instruments_df["tradingsymbol"]) == ["NEW"]
+
+
+def test_cache_from_after_0800_ist_is_reused(broker):
+    # 02:45 UTC is 08:15 IST
+    _write_cache(broker.INSTRUMENTS_CACHE_FILE, datetime(2024, 1, 2, 2, 45, tzinfo=timezone.utc))
+
+    broker.download_instruments()
+
+    broker.kite.instruments.assert_not_called()
+    assert list(broker.instruments_df["tradingsymbol"]) == ["OLD"]
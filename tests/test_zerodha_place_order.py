@@ -0,0 +1,73 @@
+from unittest import mock
+
+import pytest
+
+zerodha = pytest.importorskip("brokers.zerodha")
+requests = pytest.importorskip("requests")
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+ORDER = dict(symbol="NIFTY24JAN21000CE", quantity=75, price=0, transaction_type="SELL",
+             order_type="MARKET", variety="REGULAR", exchange="NFO", product="NRML", tag="Survivor")
+
+
+def _book_entry(order_id, status="OPEN"):
+    return {"order_id": order_id, "status": status, "exchange": "NFO", "tradingsymbol": ORDER["symbol"],
+            "transaction_type": "SELL", "quantity": 75, "tag": "Survivor"}
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    monkeypatch.setattr(zerodha.time, "sleep", lambda seconds: None)
+    broker = zerodha.ZerodhaBroker.__new__(zerodha.ZerodhaBroker)
+    broker.kite = mock.Mock()
+    return broker
+
+
+def test_timeout_then_order_found_is_not_resent(broker):
+    broker.kite.orders.side_effect = [[], [_book_entry("222")]]
+    broker.kite.place_order.side_effect = requests.exceptions.ReadTimeout()
+
+    assert broker.place_order(**ORDER) == "222"
+    assert broker.kite.place_order.call_count == 1
+
+
+def test_timeout_then_order_not_found_is_resent(broker):
+    broker.kite.orders.side_effect = [[], []]
+    broker.kite.place_order.side_effect = [requests.exceptions.ReadTimeout(), "222"]
+
+    assert broker.place_order(**ORDER) == "222"
+    assert broker.kite.place_order.call_count == 2
+
+
+def test_earlier_identical_order_is_not_taken_for_this_one(broker):
+    earlier = _book_entry("111", status="COMPLETE")
+    broker.kite.orders.side_effect = [[earlier], [earlier]]
+    broker.kite.place_order.side_effect = [requests.exceptions.ReadTimeout(), "222"]
+
+    assert broker.place_order(**ORDER) == "222"
+    assert broker.kite.place_order.call_count == 2
+
+
+def test_new_rejected_order_does_not_count_as_placed(broker):
+    broker.kite.orders.side_effect = [[], [_book_entry("222", status="REJECTED")]]
+    broker.kite.place_order.side_effect = [zerodha.NetworkException("503"), "333"]
+
+    assert broker.place_order(**ORDER) == "333"
+
+
+def test_ambiguous_failure_without_order_book_snapshot_is_not_resent(broker):
+    broker.kite.orders.side_effect = requests.exceptions.ConnectionError("down")
+    broker.kite.place_order.side_effect = requests.exceptions.ReadTimeout()
+
+    assert broker.place_order(**ORDER) == -1
+    assert broker.kite.place_order.call_count == 1
+
+
+def test_connect_failure_is_resent_without_lookup(broker):
+    refused = requests.exceptions.ConnectionError(
+        MaxRetryError(None, "/orders", NewConnectionError(None, "refused")))
+    broker.kite.orders.side_effect = [[]]
+    broker.kite.place_order.side_effect = [refused, "222"]
+
+    assert broker.place_order(**ORDER) == "222"
+    assert broker.kite.orders.call_count == 1
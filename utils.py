@@ -0,0 +1,55 @@
+import json
+from typing import Any
+
+import requests
+try:
+    import orjson  # Optional: faster JSON encode/decode when installed
+except ImportError:
+    orjson = None
+
+from logger import logger
+
+
+def json_loads(data) -> Any:
+    """Decodes JSON from str/bytes, using orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def json_dumps(obj, pretty: bool = False) -> bytes:
+    """Encodes an object to UTF-8 JSON bytes, using orjson when available.
+
+    Bytes can be sent as a request body or written to a binary file as-is,
+    so orjson's output never needs decoding. The stdlib fallback produces
+    the same layout as orjson, so files written with either encoder match.
+
+    Args:
+        obj: The object to encode.
+        pretty (bool): Whether to indent the output for readability.
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    if orjson is not None:
+        # Non-str keys (e.g., numeric order IDs) are stringified, as the stdlib does.
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def prewarm_connection(session: requests.Session, url: str):
+    """Opens a pooled keep-alive connection to `url`'s host ahead of use.
+
+    A throwaway HEAD pays the TCP/TLS handshake early and leaves the
+    connection in the session's pool for the next request to that host.
+    Failures are ignored.
+
+    Args:
+        session (requests.Session): The session whose pool receives the connection.
+        url (str): Any URL on the host to connect to.
+    """
+    try:
+        session.head(url, timeout=5)
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Connection prewarm for {url} failed: {e}")